@@ -0,0 +1,63 @@
+"""Асинхронные точки входа для нагруженных эндпоинтов чтения.
+
+В Django 3.2 нет асинхронного ORM, а синхронные view под ASGI
+выполняются в одном потоке на процесс, так что параллельные запросы
+выстраиваются к нему в очередь. Обёртка запускает view DRF в пуле
+потоков через ``sync_to_async(thread_sensitive=False)``: цикл событий
+не блокируется на время ответа базы и продолжает принимать запросы.
+"""
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+from django.urls import URLPattern
+
+from .connections import schedule_health_checks
+
+ASYNC_ROUTES = (
+    'titles-list',
+    'titles-detail',
+    'reviews-list',
+    'genre-list',
+    'categories-list',
+)
+
+
+def _run_in_worker(view):
+    def run(request, *args, **kwargs):
+        # request_started помечает соединения потока-обработчика, а view
+        # работает с соединением потока пула.
+        schedule_health_checks()
+        try:
+            response = view(request, *args, **kwargs)
+            # Сериализация в JSON тоже выполняется в потоке пула.
+            if callable(getattr(response, 'render', None)):
+                response.render()
+            return response
+        finally:
+            # Сигналы request_started/finished закрывают соединения
+            # только в потоке обработчика, а не в потоках пула.
+            close_old_connections()
+    return run
+
+
+def as_async_view(view):
+    run = sync_to_async(_run_in_worker(view), thread_sensitive=False)
+
+    @wraps(view)
+    async def async_view(request, *args, **kwargs):
+        return await run(request, *args, **kwargs)
+    return async_view
+
+
+def with_async_views(patterns, names=ASYNC_ROUTES):
+    """Заменяет view маршрутов ``names`` на асинхронные."""
+    return [
+        URLPattern(
+            pattern.pattern, as_async_view(pattern.callback),
+            pattern.default_args, pattern.name,
+        )
+        if isinstance(pattern, URLPattern) and pattern.name in names
+        else pattern
+        for pattern in patterns
+    ]
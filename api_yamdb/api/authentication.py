@@ -0,0 +1,77 @@
+"""Аутентификация по JWT с кешированием пользователя.
+
+Права доступа проверяют только роль и признак суперпользователя, поэтому
+для них достаточно компактного снимка строки пользователя. Снимок
+хранится в кеше ``API_CACHE_ALIAS`` не дольше ``AUTH_USER_CACHE_TIMEOUT``
+секунд и удаляется при сохранении или удалении пользователя. Остальные
+поля модели в снимке отложены (deferred) и загружаются при обращении.
+"""
+from django.conf import settings
+from django.db import router
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import (AuthenticationFailed,
+                                                 InvalidToken)
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from users.models import User
+
+from .cache import get_cache
+
+# Model.from_db ждёт значения в порядке полей модели.
+SNAPSHOT_FIELDS = tuple(
+    field.attname for field in User._meta.concrete_fields
+    if field.attname in ('id', 'username', 'role', 'is_superuser', 'is_active')
+)
+
+
+def user_cache_key(user_id):
+    return f'auth-user:{user_id}'
+
+
+def forget_user(user_id):
+    get_cache().delete(user_cache_key(user_id))
+
+
+def user_from_snapshot(values):
+    return User.from_db(router.db_for_read(User), SNAPSHOT_FIELDS, values)
+
+
+def load_user(user_id):
+    """Возвращает пользователя из снимка или None, если его нет в БД.
+
+    Снимок берётся из кеша, а при промахе загружается одним запросом и
+    кешируется на ``AUTH_USER_CACHE_TIMEOUT`` секунд.
+    """
+    cache = get_cache()
+    key = user_cache_key(user_id)
+    values = cache.get(key)
+    if values is None:
+        values = User.objects.filter(
+            **{jwt_settings.USER_ID_FIELD: user_id}
+        ).values_list(*SNAPSHOT_FIELDS).first()
+        if values is None:
+            return None
+        if settings.AUTH_USER_CACHE_TIMEOUT:
+            cache.set(key, values, settings.AUTH_USER_CACHE_TIMEOUT)
+    return user_from_snapshot(values)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[jwt_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                _('Token contained no recognizable user identification')
+            )
+        user = load_user(user_id)
+        if user is None:
+            raise AuthenticationFailed(
+                _('User not found'), code='user_not_found'
+            )
+        if not user.is_active:
+            raise AuthenticationFailed(
+                _('User is inactive'), code='user_inactive'
+            )
+        return user
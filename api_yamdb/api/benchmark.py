@@ -0,0 +1,393 @@
+"""Нагрузочные замеры эндпоинтов /api/v1 на синтетических данных."""
+import json
+import statistics
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from itertools import cycle
+from urllib.error import HTTPError, URLError
+from urllib.request import Request, urlopen
+
+from django.conf import settings
+from django.contrib.auth.tokens import default_token_generator
+from django.db import close_old_connections, connection
+from django.db.backends.signals import connection_created
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import RefreshToken
+from reviews.models import (Category, Comment, Genre, Review, Title,
+                            TitleRanking)
+from users.models import User
+
+from .cache import invalidate
+from .queries import QueryCounter, collect_queries
+from .signals import CATALOGUE_SCOPES
+from .urls import router_v1
+
+BENCHMARK_PREFIX = 'bench'
+CACHE_SCOPES = sorted(
+    {scope for scopes in CATALOGUE_SCOPES.values() for scope in scopes}
+)
+
+
+def seed_dataset(titles=100, genres=10, categories=5, users=20,
+                 reviews_per_title=10, comments_per_review=2,
+                 batch_size=1000):
+    """Заполняет базу синтетическими данными пакетными вставками."""
+    User.objects.bulk_create(
+        [
+            User(
+                username=f'{BENCHMARK_PREFIX}_user_{i}',
+                email=f'{BENCHMARK_PREFIX}_user_{i}@yamdb.fake',
+            )
+            for i in range(users)
+        ],
+        batch_size=batch_size,
+    )
+    Category.objects.bulk_create(
+        [
+            Category(name=f'Категория {i}', slug=f'{BENCHMARK_PREFIX}-cat-{i}')
+            for i in range(categories)
+        ],
+        batch_size=batch_size,
+    )
+    Genre.objects.bulk_create(
+        [
+            Genre(name=f'Жанр {i}', slug=f'{BENCHMARK_PREFIX}-genre-{i}')
+            for i in range(genres)
+        ],
+        batch_size=batch_size,
+    )
+    user_ids = list(User.objects.filter(
+        username__startswith=BENCHMARK_PREFIX
+    ).values_list('id', flat=True))
+    category_ids = list(Category.objects.filter(
+        slug__startswith=BENCHMARK_PREFIX
+    ).values_list('id', flat=True))
+    genre_ids = list(Genre.objects.filter(
+        slug__startswith=BENCHMARK_PREFIX
+    ).values_list('id', flat=True))
+
+    categories_cycle = cycle(category_ids)
+    Title.objects.bulk_create(
+        [
+            Title(
+                name=f'{BENCHMARK_PREFIX} {i}',
+                year=1900 + i % 120,
+                category_id=next(categories_cycle),
+                description='Описание произведения',
+            )
+            for i in range(titles)
+        ],
+        batch_size=batch_size,
+    )
+    title_ids = list(Title.objects.filter(
+        name__startswith=BENCHMARK_PREFIX
+    ).values_list('id', flat=True))
+
+    through = Title.genre.through
+    through.objects.bulk_create(
+        [
+            through(title_id=title_id, genre_id=genre_ids[(i + j) % genres])
+            for i, title_id in enumerate(title_ids)
+            for j in range(min(2, genres))
+        ],
+        batch_size=batch_size,
+    )
+    Review.objects.bulk_create(
+        [
+            Review(
+                title_id=title_id,
+                author_id=user_ids[j % users],
+                text='Синтетический отзыв',
+                score=(i + j) % 10 + 1,
+            )
+            for i, title_id in enumerate(title_ids)
+            for j in range(min(reviews_per_title, users))
+        ],
+        batch_size=batch_size,
+    )
+    review_ids = Review.objects.filter(
+        title_id__in=title_ids
+    ).values_list('id', flat=True)
+    Comment.objects.bulk_create(
+        [
+            Comment(
+                review_id=review_id,
+                author_id=user_ids[j % users],
+                text='Синтетический комментарий',
+            )
+            for review_id in review_ids.iterator()
+            for j in range(comments_per_review)
+        ],
+        batch_size=batch_size,
+    )
+    Title.objects.filter(pk__in=title_ids).refresh_rating()
+    TitleRanking.objects.mark_stale()
+    TitleRanking.objects.refresh_due(
+        settings.RANKING['TRENDING_DAYS'], batch_size
+    )
+    return User.objects.create_user(
+        username=f'{BENCHMARK_PREFIX}_admin',
+        email=f'{BENCHMARK_PREFIX}_admin@yamdb.fake',
+        role=User.ADMIN,
+    )
+
+
+def _sample_kwargs():
+    review = Review.objects.filter(comments__isnull=False).order_by(
+        'pk'
+    ).first()
+    comment = review.comments.order_by('pk').first()
+    return {
+        'users': {'username': review.author.username},
+        'reviews': {'title_id': review.title_id, 'pk': review.pk},
+        'comments': {
+            'title_id': review.title_id,
+            'review_id': review.pk,
+            'pk': comment.pk,
+        },
+        'titles': {'pk': review.title_id},
+        'genre': {'slug': Genre.objects.order_by('pk').first().slug},
+        'categories': {'slug': Category.objects.order_by('pk').first().slug},
+    }
+
+
+def collect_endpoints():
+    """Собирает по маршрутам роутера список запросов для замера.
+
+    Безопасные методы замеряются для всех маршрутов, для остальных
+    используются заранее подготовленные тела запросов.
+    """
+    samples = _sample_kwargs()
+    author = User.objects.get(username=samples['users']['username'])
+    payloads = {
+        ('signup-list', 'post'): {
+            'username': author.username, 'email': author.email,
+        },
+    }
+    endpoints = []
+    for pattern in router_v1.urls:
+        if pattern.name == 'api-root':
+            continue
+        if 'format' in pattern.pattern.regex.groupindex:
+            continue
+        basename = next(
+            name for _, _, name in router_v1.registry
+            if pattern.name.startswith(f'{name}-')
+        )
+        kwargs = {
+            key: value for key, value in samples.get(basename, {}).items()
+            if key in pattern.pattern.regex.groupindex
+        }
+        path = reverse(pattern.name, kwargs=kwargs)
+        actions = getattr(pattern.callback, 'actions', {})
+        if 'get' in actions:
+            endpoints.append((f'GET {pattern.name}', 'get', path, None))
+        if (pattern.name, 'post') in payloads:
+            endpoints.append((
+                f'POST {pattern.name}', 'post', path,
+                payloads[(pattern.name, 'post')],
+            ))
+    endpoints.append((
+        'POST auth_token', 'post', reverse('auth_token'),
+        {
+            'username': author.username,
+            'confirmation_code': default_token_generator.make_token(author),
+        },
+    ))
+    return endpoints
+
+
+def _drop_cached_responses():
+    # Снимки пользователей остаются в кеше: сбрасываются только ответы.
+    invalidate(*CACHE_SCOPES)
+
+
+def _time_requests(send, path, kwargs, iterations, cached):
+    timings = []
+    for _ in range(iterations):
+        if not cached:
+            _drop_cached_responses()
+        started = time.perf_counter()
+        send(path, **kwargs)
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def _percentile(values, percent):
+    ordered = sorted(values)
+    index = max(0, int(round(percent / 100 * len(ordered))) - 1)
+    return ordered[index]
+
+
+# Повторные запросы к signup и auth/token иначе упрутся в лимиты.
+@override_settings(THROTTLE_ENABLED=False)
+def run_benchmark(admin, iterations=20):
+    """Замеряет задержку, число запросов к БД и память для каждого эндпоинта.
+
+    Перед каждым замеряемым запросом кеш ответов сбрасывается, иначе для
+    кешируемых списков замерялись бы только попадания в кеш. Задержка
+    ответа из кеша выводится отдельно (``cached_p50_ms``,
+    ``cached_p95_ms``). Возвращает словарь ``{название: метрики}``.
+    """
+    client = Client()
+    token = RefreshToken.for_user(admin).access_token
+    headers = {'HTTP_AUTHORIZATION': f'Bearer {token}'}
+    results = {}
+    for name, method, path, payload in collect_endpoints():
+        send = getattr(client, method)
+        kwargs = dict(headers)
+        if payload is not None:
+            kwargs.update(data=payload, content_type='application/json')
+
+        _drop_cached_responses()
+        with CaptureQueriesContext(connection) as queries:
+            response = send(path, **kwargs)
+        query_count = len(queries)
+        _drop_cached_responses()
+        tracemalloc.start()
+        send(path, **kwargs)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        timings = _time_requests(send, path, kwargs, iterations, cached=False)
+        send(path, **kwargs)
+        cached_timings = _time_requests(
+            send, path, kwargs, iterations, cached=True
+        )
+
+        results[name] = {
+            'path': path,
+            'status': response.status_code,
+            'queries': query_count,
+            'p50_ms': round(statistics.median(timings), 3),
+            'p95_ms': round(_percentile(timings, 95), 3),
+            'cached_p50_ms': round(statistics.median(cached_timings), 3),
+            'cached_p95_ms': round(_percentile(cached_timings, 95), 3),
+            'memory_kb': round(peak / 1024, 1),
+        }
+    return results
+
+
+def run_connection_benchmark(path, requests=200, conn_max_age=60):
+    """Сравнивает задержку запроса с новым и с повторным соединением.
+
+    После каждого запроса соединения закрываются так же, как это делает
+    сервер приложения по сигналу request_finished (тестовый клиент этот
+    шаг пропускает). Кеш ответов сбрасывается перед каждым запросом,
+    иначе ответ из кеша не обращался бы к БД. Возвращает словарь
+    ``{CONN_MAX_AGE: метрики}``.
+    """
+    client = Client()
+    opened = []
+
+    def count_connection(sender, connection, **kwargs):
+        opened.append(connection.alias)
+
+    results = {}
+    old_max_age = connection.settings_dict['CONN_MAX_AGE']
+    connection_created.connect(count_connection)
+    try:
+        for max_age in (0, conn_max_age):
+            connection.settings_dict['CONN_MAX_AGE'] = max_age
+            connection.close()
+            opened.clear()
+            timings = []
+            with collect_queries(QueryCounter()) as queries:
+                for _ in range(requests):
+                    _drop_cached_responses()
+                    started = time.perf_counter()
+                    response = client.get(path)
+                    close_old_connections()
+                    timings.append((time.perf_counter() - started) * 1000)
+            results[max_age] = {
+                'status': response.status_code,
+                'connections': len(opened),
+                'queries': queries.count,
+                'p50_ms': round(statistics.median(timings), 3),
+                'p95_ms': round(_percentile(timings, 95), 3),
+            }
+    finally:
+        connection_created.disconnect(count_connection)
+        connection.settings_dict['CONN_MAX_AGE'] = old_max_age
+        connection.close()
+    return results
+
+
+def _timed_get(url, headers, timeout):
+    started = time.perf_counter()
+    try:
+        with urlopen(Request(url, headers=headers), timeout=timeout) as reply:
+            reply.read()
+            ok = reply.status < 400
+    except (HTTPError, URLError, OSError):
+        ok = False
+    return (time.perf_counter() - started) * 1000, ok
+
+
+def run_load_test(urls, concurrency=20, requests=500, headers=None,
+                  timeout=30):
+    """Нагружает запущенный сервер параллельными GET-запросами.
+
+    В отличие от run_benchmark, запросы идут по сети к настоящему серверу,
+    поэтому так можно сравнить режимы WSGI и ASGI. Возвращает словарь
+    ``{адрес: метрики}``.
+    """
+    headers = headers or {}
+    results = {}
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for url in urls:
+            started = time.perf_counter()
+            replies = list(pool.map(
+                lambda _: _timed_get(url, headers, timeout), range(requests)
+            ))
+            elapsed = time.perf_counter() - started
+            timings = [duration for duration, _ in replies]
+            results[url] = {
+                'requests': requests,
+                'errors': sum(1 for _, ok in replies if not ok),
+                'rps': round(requests / elapsed, 1),
+                'p50_ms': round(statistics.median(timings), 3),
+                'p95_ms': round(_percentile(timings, 95), 3),
+                'p99_ms': round(_percentile(timings, 99), 3),
+            }
+    return results
+
+
+def compare_with_baseline(results, baseline, tolerance=0.25):
+    """Возвращает список регрессий относительно сохранённого замера.
+
+    Число запросов к БД не должно расти вовсе, задержка p95 и память —
+    не больше чем на ``tolerance``.
+    """
+    regressions = []
+    for name, expected in baseline.items():
+        actual = results.get(name)
+        if actual is None:
+            regressions.append(f'{name}: эндпоинт не замерен')
+            continue
+        if actual['queries'] > expected['queries']:
+            regressions.append(
+                f'{name}: запросов к БД {actual["queries"]}, '
+                f'было {expected["queries"]}'
+            )
+        for metric in ('p95_ms', 'memory_kb'):
+            limit = expected[metric] * (1 + tolerance)
+            if actual[metric] > limit:
+                regressions.append(
+                    f'{name}: {metric} {actual[metric]}, '
+                    f'было {expected[metric]}'
+                )
+    return regressions
+
+
+def load_baseline(path):
+    with open(path, encoding='utf-8') as file:
+        return json.load(file)
+
+
+def save_baseline(results, path):
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(results, file, ensure_ascii=False, indent=2, sort_keys=True)
@@ -0,0 +1,154 @@
+"""Кеширование ответов для редко меняющихся эндпоинтов каталога.
+
+Ключ ответа строится из адреса запроса, роли пользователя и поколений
+областей (``scope``), от которых зависит ответ. При изменении данных
+поколение области увеличивается, и все ответы, собранные по ней,
+перестают находиться в кеше, не затрагивая остальные ключи. Рядом с
+поколением хранится время изменения области: по ним условные GET строят
+ETag и Last-Modified без запросов к БД.
+"""
+import time
+from datetime import datetime, timezone
+from functools import partial
+from hashlib import md5
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.response import Response
+
+from .routers import reading_from_replica
+
+KEY_PREFIX = 'api-response'
+HITS_KEY = f'{KEY_PREFIX}:hits'
+MISSES_KEY = f'{KEY_PREFIX}:misses'
+
+
+def get_cache():
+    return caches[settings.API_CACHE_ALIAS]
+
+
+def _generation_key(scope):
+    return f'{KEY_PREFIX}:generation:{scope}'
+
+
+def _increment(key):
+    cache = get_cache()
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
+
+
+def _changed_key(scope):
+    return f'{KEY_PREFIX}:changed:{scope}'
+
+
+def _modified_key(scope):
+    return f'{KEY_PREFIX}:modified:{scope}'
+
+
+def invalidate(*scopes):
+    """Сбрасывает все закешированные ответы, зависящие от ``scopes``."""
+    for scope in scopes:
+        _increment(_generation_key(scope))
+    get_cache().set_many(
+        {_modified_key(scope): time.time() for scope in scopes}, None
+    )
+    if settings.DATABASE_REPLICAS:
+        # Пока реплики могут отставать, прочитанные из них ответы не
+        # кешируются, иначе старые данные остались бы в кеше надолго.
+        get_cache().set_many(
+            {_changed_key(scope): True for scope in scopes},
+            settings.REPLICA_STICKY_SECONDS,
+        )
+
+
+def replica_may_lag(scopes):
+    return reading_from_replica() and bool(
+        get_cache().get_many([_changed_key(scope) for scope in scopes])
+    )
+
+
+def get_cache_stats():
+    stats = get_cache().get_many((HITS_KEY, MISSES_KEY))
+    return {
+        'hits': stats.get(HITS_KEY, 0),
+        'misses': stats.get(MISSES_KEY, 0),
+    }
+
+
+def get_user_role(user):
+    if not user.is_authenticated:
+        return 'anonymous'
+    return user.role
+
+
+def _version(scopes, generations):
+    return '.'.join(
+        str(generations.get(_generation_key(scope), 0)) for scope in scopes
+    )
+
+
+def get_scopes_state(scopes):
+    """Возвращает время последнего изменения ``scopes`` и их поколения.
+
+    Если время изменения вытеснено из кеша, им становится текущее время:
+    поколения при этом тоже могли обнулиться, и ETag не должен совпасть
+    с выданным до вытеснения.
+    """
+    cache = get_cache()
+    modified_keys = [_modified_key(scope) for scope in scopes]
+    state = cache.get_many(
+        modified_keys + [_generation_key(scope) for scope in scopes]
+    )
+    now = time.time()
+    for key in modified_keys:
+        if key not in state:
+            state[key] = (
+                now if cache.add(key, now, timeout=None)
+                else cache.get(key, now)
+            )
+    modified = max(state[key] for key in modified_keys)
+    return (
+        datetime.fromtimestamp(modified, tz=timezone.utc),
+        _version(scopes, state),
+    )
+
+
+def make_response_key(request, scopes):
+    generations = get_cache().get_many(
+        [_generation_key(scope) for scope in scopes]
+    )
+    version = _version(scopes, generations)
+    url = md5(request.build_absolute_uri().encode()).hexdigest()
+    return (
+        f'{KEY_PREFIX}:{url}:{get_user_role(request.user)}:{version}'
+    )
+
+
+def cached_response(request, scopes, get_response):
+    """Возвращает ответ из кеша или кеширует ответ ``get_response()``."""
+    cache = get_cache()
+    key = make_response_key(request, scopes)
+    cached = cache.get(key)
+    if cached is not None:
+        _increment(HITS_KEY)
+        return Response(cached)
+    _increment(MISSES_KEY)
+    response = get_response()
+    if response.status_code == 200 and not replica_may_lag(scopes):
+        cache.set(key, response.data, settings.API_CACHE_TIMEOUT)
+    return response
+
+
+class CachedListMixin:
+    """Кеширует ответы на запросы списка объектов."""
+    cache_scopes = ()
+
+    def list(self, request, *args, **kwargs):
+        return cached_response(
+            request,
+            self.cache_scopes,
+            partial(super().list, request, *args, **kwargs),
+        )
@@ -0,0 +1,55 @@
+"""Проверка постоянных соединений с БД перед первым запросом к ним.
+
+При ``CONN_MAX_AGE > 0`` соединение переживает запрос, и его может
+закрыть сервер БД, PgBouncer или сетевой сбой. В Django 3.2 нет
+настройки ``CONN_HEALTH_CHECKS``, поэтому такое соединение
+обнаруживается только по ошибке первого запроса к БД. Здесь, как в
+Django 4.1, в начале запроса открытые соединения лишь помечаются, а
+проверяется соединение при первом обращении к нему: запросы, которые
+не ходят в БД (ответы из кеша, отказы по лимиту), ничего не проверяют.
+"""
+from functools import wraps
+
+from django.conf import settings
+from django.core.signals import request_started
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+
+def schedule_health_checks():
+    """Помечает открытые соединения текущего потока для проверки."""
+    if not settings.DB_CONN_HEALTH_CHECKS:
+        return
+    for connection in connections.all():
+        connection.health_check_pending = connection.connection is not None
+
+
+def _with_health_check(connection, ensure_connection):
+    @wraps(ensure_connection)
+    def ensure():
+        if getattr(connection, 'health_check_pending', False):
+            connection.health_check_pending = False
+            if (
+                connection.connection is not None
+                and not connection.in_atomic_block
+                and not connection.is_usable()
+            ):
+                connection.close()
+        ensure_connection()
+    return ensure
+
+
+@receiver(connection_created)
+def install_health_check(sender, connection, **kwargs):
+    # Обёртка ставится на объект соединения один раз и переживает
+    # переподключения: ensure_connection вызывается перед каждым курсором.
+    if 'ensure_connection' not in vars(connection):
+        connection.ensure_connection = _with_health_check(
+            connection, connection.ensure_connection
+        )
+
+
+@receiver(request_started)
+def check_connections(**kwargs):
+    schedule_health_checks()
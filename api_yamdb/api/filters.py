@@ -1,5 +1,9 @@
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connection
+from django.db.models import F, Q
 from django_filters.rest_framework import CharFilter, FilterSet
-from reviews.models import Title
+from rest_framework.filters import OrderingFilter
+from reviews.models import SEARCH_CONFIG, Title
 
 
 class TitleFilter(FilterSet):
@@ -9,13 +13,85 @@ class TitleFilter(FilterSet):
     )
     genre = CharFilter(
         field_name='genre__slug',
-        lookup_expr='contains',
+        lookup_expr='exact',
     )
     category = CharFilter(
         field_name='category__slug',
-        lookup_expr='contains',
+        lookup_expr='exact',
     )
+    search = CharFilter(method='filter_search')
 
     class Meta:
         fields = ('name', 'category', 'genre', 'year')
         model = Title
+
+    def filter_search(self, queryset, name, value):
+        if connection.vendor != 'postgresql':
+            return queryset.filter(
+                Q(name__icontains=value) | Q(description__icontains=value)
+            )
+        query = SearchQuery(
+            value, config=SEARCH_CONFIG, search_type='websearch'
+        )
+        return queryset.filter(search_vector=query).annotate(
+            rank=SearchRank(F('search_vector'), query)
+        ).order_by('-rank', 'id')
+
+
+class RankingFilter(FilterSet):
+    genre = CharFilter(
+        field_name='genre__slug',
+        lookup_expr='exact',
+    )
+    category = CharFilter(
+        field_name='category__slug',
+        lookup_expr='exact',
+    )
+
+    class Meta:
+        fields = ('category', 'genre')
+        model = Title
+
+
+class TitleOrderingFilter(OrderingFilter):
+    """Сортировка произведений по индексированным полям.
+
+    Сохраняет сортировку по релевантности при полнотекстовом поиске,
+    принимает ``review_count`` как имя поля ``rating_count``, добавляет
+    ``id`` для однозначного порядка страниц и ставит произведения без
+    оценок в конец в обоих направлениях, как в индексах по рейтингу.
+    """
+    aliases = {'review_count': 'rating_count'}
+    nullable = ('rating',)
+
+    def filter_queryset(self, request, queryset, view):
+        if (
+            request.query_params.get('search')
+            and self.ordering_param not in request.query_params
+            and 'rank' in queryset.query.annotations
+        ):
+            return queryset
+        ordering = self.get_ordering(request, queryset, view)
+        if not ordering:
+            return queryset
+        return queryset.order_by(*(
+            self.order_expression(term) for term in ordering
+        ))
+
+    def get_ordering(self, request, queryset, view):
+        ordering = [
+            ('-' if term.startswith('-') else '')
+            + self.aliases.get(term.lstrip('-'), term.lstrip('-'))
+            for term in super().get_ordering(request, queryset, view) or ()
+        ]
+        if ordering and ordering[-1].lstrip('-') not in ('id', 'pk'):
+            ordering.append('-id' if ordering[-1].startswith('-') else 'id')
+        return ordering
+
+    def order_expression(self, term):
+        name = term.lstrip('-')
+        if name not in self.nullable:
+            return term
+        if term.startswith('-'):
+            return F(name).desc(nulls_last=True)
+        return F(name).asc(nulls_last=True)
@@ -0,0 +1,84 @@
+from api.benchmark import (compare_with_baseline, load_baseline, run_benchmark,
+                           save_baseline, seed_dataset)
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+
+class Command(BaseCommand):
+    help = (
+        'Заполняет тестовую базу синтетическими данными и замеряет '
+        'задержку, число запросов к БД и память для эндпоинтов /api/v1.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--titles', type=int, default=100)
+        parser.add_argument('--genres', type=int, default=10)
+        parser.add_argument('--categories', type=int, default=5)
+        parser.add_argument('--users', type=int, default=20)
+        parser.add_argument('--reviews-per-title', type=int, default=10)
+        parser.add_argument('--comments-per-review', type=int, default=2)
+        parser.add_argument('--iterations', type=int, default=20)
+        parser.add_argument(
+            '--baseline',
+            help='Путь к файлу с эталонным замером.',
+        )
+        parser.add_argument(
+            '--save-baseline',
+            action='store_true',
+            help='Сохранить результат как эталонный замер.',
+        )
+        parser.add_argument(
+            '--tolerance',
+            type=float,
+            default=0.25,
+            help='Допустимый рост задержки и памяти относительно эталона.',
+        )
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(
+            verbosity=0, autoclobber=True
+        )
+        try:
+            admin = seed_dataset(
+                titles=options['titles'],
+                genres=options['genres'],
+                categories=options['categories'],
+                users=options['users'],
+                reviews_per_title=options['reviews_per_title'],
+                comments_per_review=options['comments_per_review'],
+            )
+            results = run_benchmark(admin, iterations=options['iterations'])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        self.stdout.write(
+            f'{"Эндпоинт":<40}{"запросы":>9}{"p50, мс":>10}'
+            f'{"p95, мс":>10}{"p95 кеш, мс":>13}{"память, КБ":>12}'
+        )
+        for name, metrics in sorted(results.items()):
+            self.stdout.write(
+                f'{name:<40}{metrics["queries"]:>9}{metrics["p50_ms"]:>10}'
+                f'{metrics["p95_ms"]:>10}{metrics["cached_p95_ms"]:>13}'
+                f'{metrics["memory_kb"]:>12}'
+            )
+
+        baseline_path = options['baseline']
+        if not baseline_path:
+            return
+        if options['save_baseline']:
+            save_baseline(results, baseline_path)
+            self.stdout.write(
+                self.style.SUCCESS(f'Эталон сохранён в {baseline_path}')
+            )
+            return
+        regressions = compare_with_baseline(
+            results, load_baseline(baseline_path), options['tolerance']
+        )
+        if regressions:
+            raise CommandError(
+                'Обнаружены регрессии:\n' + '\n'.join(regressions)
+            )
+        self.stdout.write(self.style.SUCCESS('Регрессий не обнаружено'))
@@ -0,0 +1,59 @@
+from api.benchmark import run_connection_benchmark, seed_dataset
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+
+class Command(BaseCommand):
+    help = (
+        'Замеряет в тестовой базе задержку запроса к API с новым '
+        'соединением на каждый запрос и с повторным использованием '
+        'соединения (CONN_MAX_AGE).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path',
+            default='/api/v1/genres/',
+            help='Адрес замеряемого эндпоинта.',
+        )
+        parser.add_argument('--requests', type=int, default=200)
+        parser.add_argument(
+            '--conn-max-age',
+            type=int,
+            default=60,
+            help='CONN_MAX_AGE для режима с повторным использованием.',
+        )
+
+    def handle(self, *args, **options):
+        if options['conn_max_age'] <= 0:
+            raise CommandError('--conn-max-age должен быть больше нуля.')
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(
+            verbosity=0, autoclobber=True
+        )
+        try:
+            seed_dataset(titles=10, reviews_per_title=2)
+            results = run_connection_benchmark(
+                options['path'],
+                requests=options['requests'],
+                conn_max_age=options['conn_max_age'],
+            )
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        self.stdout.write(
+            f'{"CONN_MAX_AGE":<14}{"соединений":>12}{"p50, мс":>10}'
+            f'{"p95, мс":>10}'
+        )
+        for max_age, metrics in results.items():
+            self.stdout.write(
+                f'{max_age:<14}{metrics["connections"]:>12}'
+                f'{metrics["p50_ms"]:>10}{metrics["p95_ms"]:>10}'
+            )
+        new, reused = results.values()
+        self.stdout.write(self.style.SUCCESS(
+            'Экономия на запросе (p50): '
+            f'{round(new["p50_ms"] - reused["p50_ms"], 3)} мс'
+        ))
@@ -0,0 +1,62 @@
+from api.benchmark import run_load_test
+from django.core.management.base import BaseCommand, CommandError
+
+DEFAULT_PATHS = (
+    '/api/v1/titles/',
+    '/api/v1/genres/',
+    '/api/v1/categories/',
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Нагружает запущенный сервер параллельными запросами и выводит '
+        'пропускную способность и задержки. Используется для сравнения '
+        'режимов SERVER_MODE=wsgi и SERVER_MODE=asgi.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--base-url',
+            default='http://localhost:8000',
+            help='Адрес запущенного сервера.',
+        )
+        parser.add_argument(
+            '--path',
+            action='append',
+            dest='paths',
+            help='Путь для нагрузки; можно указать несколько раз.',
+        )
+        parser.add_argument('--concurrency', type=int, default=20)
+        parser.add_argument('--requests', type=int, default=500)
+        parser.add_argument(
+            '--token',
+            help='JWT-токен для запросов от имени пользователя.',
+        )
+
+    def handle(self, *args, **options):
+        base_url = options['base_url'].rstrip('/')
+        urls = [
+            base_url + path for path in options['paths'] or DEFAULT_PATHS
+        ]
+        headers = {}
+        if options['token']:
+            headers['Authorization'] = f'Bearer {options["token"]}'
+        results = run_load_test(
+            urls,
+            concurrency=options['concurrency'],
+            requests=options['requests'],
+            headers=headers,
+        )
+        self.stdout.write(
+            f'{"Адрес":<50}{"ошибки":>8}{"RPS":>9}{"p50, мс":>10}'
+            f'{"p95, мс":>10}{"p99, мс":>10}'
+        )
+        for url, metrics in results.items():
+            self.stdout.write(
+                f'{url:<50}{metrics["errors"]:>8}{metrics["rps"]:>9}'
+                f'{metrics["p50_ms"]:>10}{metrics["p95_ms"]:>10}'
+                f'{metrics["p99_ms"]:>10}'
+            )
+        if any(metrics['errors'] for metrics in results.values()):
+            raise CommandError('Часть запросов завершилась ошибкой')
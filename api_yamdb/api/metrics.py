@@ -0,0 +1,110 @@
+"""Метрики API в формате Prometheus.
+
+При запуске под gunicorn с несколькими воркерами переменная окружения
+``PROMETHEUS_MULTIPROC_DIR`` включает режим prometheus_client, в котором
+каждый процесс пишет значения в mmap-файлы общего каталога, а эндпоинт
+``/metrics`` суммирует их по всем воркерам.
+"""
+import os
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+from prometheus_client import (CONTENT_TYPE_LATEST, REGISTRY,
+                               CollectorRegistry, Counter, Histogram,
+                               generate_latest, multiprocess)
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+from .cache import get_cache_stats
+
+REQUEST_LATENCY = Histogram(
+    'yamdb_http_request_duration_seconds',
+    'Время обработки запроса к API.',
+    ('view', 'action', 'method'),
+)
+REQUESTS = Counter(
+    'yamdb_http_requests_total',
+    'Количество запросов к API по статусу ответа.',
+    ('view', 'method', 'status'),
+)
+DB_QUERIES = Histogram(
+    'yamdb_db_queries_per_request',
+    'Количество запросов к БД на один запрос к API.',
+    ('view', 'action'),
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89, float('inf')),
+)
+
+ACTIVE_USERS_KEY = 'metrics:active-users'
+
+
+def _active_window():
+    window = settings.METRICS_ACTIVE_USERS_WINDOW
+    return window, int(time.time() // window)
+
+
+def record_active_user(user_id):
+    """Учитывает пользователя в счётчике активных за текущее окно.
+
+    Счётчик хранится в общем кеше, поэтому не зависит от того, какой
+    воркер обработал запрос.
+    """
+    window, bucket = _active_window()
+    cache = caches[settings.API_CACHE_ALIAS]
+    if cache.add(f'{ACTIVE_USERS_KEY}:{bucket}:{user_id}', 1, window * 2):
+        counter = f'{ACTIVE_USERS_KEY}:{bucket}'
+        cache.add(counter, 0, window * 2)
+        cache.incr(counter)
+
+
+class SharedStateCollector:
+    """Метрики, которые читаются из общего кеша в момент сбора."""
+
+    def describe(self):
+        return []
+
+    def collect(self):
+        stats = get_cache_stats()
+        for name in ('hits', 'misses'):
+            metric = CounterMetricFamily(
+                f'yamdb_api_cache_{name}',
+                f'Количество {name} кеша ответов API.',
+            )
+            metric.add_metric([], stats[name])
+            yield metric
+        total = stats['hits'] + stats['misses']
+        ratio = GaugeMetricFamily(
+            'yamdb_api_cache_hit_ratio',
+            'Доля запросов, обслуженных из кеша ответов API.',
+        )
+        ratio.add_metric([], stats['hits'] / total if total else 0)
+        yield ratio
+
+        window, bucket = _active_window()
+        active = GaugeMetricFamily(
+            'yamdb_active_users',
+            f'Пользователи, обращавшиеся к API за последние {window} с.',
+        )
+        active.add_metric([], caches[settings.API_CACHE_ALIAS].get(
+            f'{ACTIVE_USERS_KEY}:{bucket}', 0
+        ))
+        yield active
+
+
+SHARED_STATE = SharedStateCollector()
+REGISTRY.register(SHARED_STATE)
+
+
+def get_registry():
+    if 'PROMETHEUS_MULTIPROC_DIR' not in os.environ:
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    registry.register(SHARED_STATE)
+    return registry
+
+
+def metrics_view(request):
+    return HttpResponse(
+        generate_latest(get_registry()), content_type=CONTENT_TYPE_LATEST
+    )
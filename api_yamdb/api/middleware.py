@@ -0,0 +1,160 @@
+import asyncio
+import json
+import logging
+import random
+import re
+import time
+from collections import Counter
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils.deprecation import MiddlewareMixin
+
+from .metrics import DB_QUERIES, REQUEST_LATENCY, REQUESTS, record_active_user
+from .queries import QueryCounter, collect_queries
+
+logger = logging.getLogger('api.sql')
+
+IN_CLAUSE = re.compile(r'IN \((?:%s, )*%s\)')
+
+
+def query_shape(sql):
+    """Приводит запрос к виду, не зависящему от числа параметров в IN."""
+    return IN_CLAUSE.sub('IN (...)', sql)
+
+
+class QueryProfiler:
+    """Сборщик статистики запросов к БД для collect_queries."""
+
+    def __init__(self, slow_query_ms):
+        self.slow_query_ms = slow_query_ms
+        self.count = 0
+        self.duration = 0.0
+        self.shapes = Counter()
+        self.slow = []
+
+    def record(self, sql, duration):
+        self.count += 1
+        self.duration += duration
+        self.shapes[query_shape(sql)] += 1
+        if duration >= self.slow_query_ms:
+            self.slow.append({'sql': sql, 'ms': round(duration, 2)})
+
+
+class SQLProfilingMiddleware(MiddlewareMixin):
+    """Считает запросы к БД и их время для доли запросов к API.
+
+    Результат добавляется в заголовок ``Server-Timing`` и пишется в лог
+    ``api.sql`` одной JSON-строкой. Повторяющиеся запросы одного вида
+    (признак N+1) и медленные запросы выводятся с уровнем WARNING.
+    Включается настройкой ``SQL_PROFILING['ENABLED']``.
+    """
+
+    def __init__(self, get_response):
+        config = settings.SQL_PROFILING
+        if not config['ENABLED']:
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+        self.sample_rate = config['SAMPLE_RATE']
+        self.slow_query_ms = config['SLOW_QUERY_MS']
+        self.repeated_threshold = config['REPEATED_QUERY_THRESHOLD']
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        if random.random() >= self.sample_rate:
+            return self.get_response(request)
+        profiler = QueryProfiler(self.slow_query_ms)
+        started = time.perf_counter()
+        with collect_queries(profiler):
+            response = self.get_response(request)
+        return self.finish(request, response, profiler, started)
+
+    async def __acall__(self, request):
+        if random.random() >= self.sample_rate:
+            return await self.get_response(request)
+        profiler = QueryProfiler(self.slow_query_ms)
+        started = time.perf_counter()
+        with collect_queries(profiler):
+            response = await self.get_response(request)
+        return self.finish(request, response, profiler, started)
+
+    def finish(self, request, response, profiler, started):
+        total = (time.perf_counter() - started) * 1000
+        response['Server-Timing'] = (
+            f'db;dur={profiler.duration:.2f};desc="{profiler.count} queries",'
+            f' total;dur={total:.2f}'
+        )
+        self.log(request, response, profiler, total)
+        return response
+
+    def log(self, request, response, profiler, total):
+        match = request.resolver_match
+        repeated = [
+            {'sql': shape, 'count': count}
+            for shape, count in profiler.shapes.most_common()
+            if count >= self.repeated_threshold
+        ]
+        record = {
+            'method': request.method,
+            'path': request.path,
+            'view': match.view_name if match else None,
+            'status': response.status_code,
+            'queries': profiler.count,
+            'db_ms': round(profiler.duration, 2),
+            'total_ms': round(total, 2),
+        }
+        if repeated or profiler.slow:
+            record.update(repeated=repeated, slow=profiler.slow)
+            logger.warning(json.dumps(record, ensure_ascii=False))
+        else:
+            logger.info(json.dumps(record, ensure_ascii=False))
+
+
+class MetricsMiddleware(MiddlewareMixin):
+    """Собирает метрики задержки, статусов и запросов к БД по view."""
+
+    def __init__(self, get_response):
+        if not settings.METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        started = time.perf_counter()
+        with collect_queries(QueryCounter()) as queries:
+            response = self.get_response(request)
+        if self.observe(request, response, queries, started):
+            self.record_user(request)
+        return response
+
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        with collect_queries(QueryCounter()) as queries:
+            response = await self.get_response(request)
+        if self.observe(request, response, queries, started):
+            # Ленивый request.user и кеш могут обращаться к БД и сети.
+            await sync_to_async(
+                self.record_user, thread_sensitive=False
+            )(request)
+        return response
+
+    def observe(self, request, response, queries, started):
+        duration = time.perf_counter() - started
+        match = request.resolver_match
+        view = match.view_name if match else 'unmatched'
+        if view == 'metrics':
+            return False
+        actions = getattr(match.func, 'actions', None) if match else None
+        action = (actions or {}).get(request.method.lower(), '')
+        REQUEST_LATENCY.labels(view, action, request.method).observe(duration)
+        REQUESTS.labels(view, request.method, response.status_code).inc()
+        DB_QUERIES.labels(view, action).observe(queries.count)
+        return True
+
+    def record_user(self, request):
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_authenticated:
+            record_active_user(user.pk)
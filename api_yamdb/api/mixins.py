@@ -1,10 +1,22 @@
+from hashlib import md5
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
 from rest_framework import status
+from rest_framework.decorators import action
 from rest_framework.filters import SearchFilter
 from rest_framework.generics import DestroyAPIView, ListCreateAPIView
+from rest_framework.permissions import SAFE_METHODS
 from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
+from reviews.models import Review, Title
 
+from .cache import get_scopes_state, replica_may_lag
 from .permissions import IsAdminOrReadOnly
+from .routers import replica_reads, stick_to_primary, use_replica
 
 
 class CategoryMixinViewSet(
@@ -19,3 +31,125 @@ class CategoryMixinViewSet(
 
     def get(self, request, *args, **kwargs):
         return Response(status=status.HTTP_405_METHOD_NOT_ALLOWED)
+
+
+class NestedTitleReviewMixin:
+    """Загружает произведение и отзыв из URL один раз за запрос."""
+
+    def get_title(self):
+        if not hasattr(self, '_title'):
+            self._title = get_object_or_404(Title, pk=self.kwargs['title_id'])
+        return self._title
+
+    def get_review(self):
+        if not hasattr(self, '_review'):
+            self._review = get_object_or_404(
+                Review.objects.select_related('title'),
+                pk=self.kwargs['review_id'],
+                title_id=self.kwargs['title_id'],
+            )
+        return self._review
+
+
+class ConditionalGetMixin:
+    """Отвечает 304 Not Modified до сериализации, если данные не менялись.
+
+    ``get_modified`` возвращает время последнего изменения данных ответа и
+    произвольную строку, дополняющую ETag. По умолчанию они берутся из
+    состояния областей кеша ``conditional_scopes`` без запросов к БД;
+    наследник объявляет области или переопределяет ``get_modified``.
+    """
+    conditional_scopes = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if (
+            not cls.conditional_scopes
+            and cls.get_modified is ConditionalGetMixin.get_modified
+        ):
+            raise ImproperlyConfigured(
+                f'{cls.__name__}: объявите conditional_scopes '
+                'или переопределите get_modified.'
+            )
+
+    def get_modified(self):
+        # Ответ из отстающей реплики не должен получить новый ETag.
+        if replica_may_lag(self.conditional_scopes):
+            return None, ''
+        return get_scopes_state(self.conditional_scopes)
+
+    def conditional_get(self, handler, request, *args, **kwargs):
+        modified, version = self.get_modified()
+        if modified is None:
+            return handler(request, *args, **kwargs)
+        last_modified = int(modified.timestamp())
+        etag = quote_etag(md5(
+            f'{request.get_full_path()}:{modified.isoformat()}:{version}'
+            .encode()
+        ).hexdigest())
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_get(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_get(
+            super().retrieve, request, *args, **kwargs
+        )
+
+
+class BulkWriteMixin:
+    """Добавляет ``POST .../bulk/`` для записи списка объектов.
+
+    Список проверяется и записывается ``bulk_serializer_class`` со
+    списковым сериализатором ``BulkListSerializer`` в одной транзакции:
+    при ошибке в любом элементе не записывается ни один.
+    """
+    bulk_serializer_class = None
+
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        serializer = self.bulk_serializer_class(
+            data=request.data, many=True,
+            context=self.get_serializer_context(),
+        )
+        with transaction.atomic():
+            serializer.is_valid(raise_exception=True)
+            objects = serializer.save()
+        return Response(
+            self.get_bulk_response_data(objects), status=status.HTTP_200_OK
+        )
+
+    def get_bulk_response_data(self, objects):
+        return self.get_serializer(objects, many=True).data
+
+
+class ReplicaReadMixin:
+    """Читает данные безопасных запросов из реплики БД.
+
+    Реплика выбирается после аутентификации, чтобы пользователь, недавно
+    изменивший данные, читал из основной базы. Успешный небезопасный
+    запрос продлевает это окно.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        with replica_reads():
+            return super().dispatch(request, *args, **kwargs)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if request.method in SAFE_METHODS:
+            use_replica(request.user)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            stick_to_primary(request.user)
+        return super().finalize_response(request, response, *args, **kwargs)
@@ -0,0 +1,66 @@
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+
+class ReviewCommentCursorPagination(CursorPagination):
+    ordering = ('-pub_date', '-id')
+
+
+class TitleCursorPagination(CursorPagination):
+    ordering = ('name', 'id')
+
+    def get_ordering(self, request, queryset, view):
+        # Курсор DRF строится по полям ordering, и порядок по
+        # релевантности поиска молча заменился бы сортировкой по name.
+        if request.query_params.get('search'):
+            raise ValidationError({
+                'pagination': 'Курсорная пагинация не поддерживает '
+                              'поиск (search).'
+            })
+        ordering = super().get_ordering(request, queryset, view)
+        # Курсор сравнивает значения поля, а у произведений без отзывов
+        # рейтинг пустой.
+        if ordering[0].lstrip('-') == 'rating':
+            raise ValidationError({
+                'ordering': 'Курсорная пагинация не поддерживает '
+                            'сортировку по rating.'
+            })
+        return ordering
+
+
+class OptionalCursorPagination(PageNumberPagination):
+    """Постраничная пагинация с переключением на курсорную.
+
+    Параметр ``?pagination=cursor`` включает курсорную пагинацию DRF без
+    подсчёта общего числа записей. Курсор хранит значение первого поля
+    сортировки и смещение: следующая страница ищется по этому полю, а
+    OFFSET пропускает только строки с тем же значением, уже отданные
+    на предыдущих страницах.
+    """
+    cursor_query_param = 'pagination'
+    cursor_query_value = 'cursor'
+    cursor_pagination_class = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if request.query_params.get(
+            self.cursor_query_param
+        ) == self.cursor_query_value:
+            self.cursor_paginator = self.cursor_pagination_class()
+            return self.cursor_paginator.paginate_queryset(
+                queryset, request, view
+            )
+        self.cursor_paginator = None
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+
+class ReviewCommentPagination(OptionalCursorPagination):
+    cursor_pagination_class = ReviewCommentCursorPagination
+
+
+class TitlePagination(OptionalCursorPagination):
+    cursor_pagination_class = TitleCursorPagination
@@ -0,0 +1,54 @@
+"""Учёт запросов к БД в пределах одного запроса к API.
+
+Обёртка ставится на каждое новое соединение, а сборщики статистики
+передаются через contextvars. Поэтому запросы учитываются и тогда, когда
+view выполняется не в потоке middleware, как асинхронные view в режиме
+ASGI.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+_collectors = ContextVar('query_collectors', default=())
+
+
+def _dispatch(execute, sql, params, many, context):
+    collectors = _collectors.get()
+    if not collectors:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration = (time.perf_counter() - started) * 1000
+        for collector in collectors:
+            collector.record(sql, duration)
+
+
+@receiver(connection_created)
+def install_query_wrapper(sender, connection, **kwargs):
+    # Вставка в начало списка: connection.execute_wrapper() снимает
+    # последнюю обёртку, и постоянная не должна оказаться на её месте.
+    if _dispatch not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, _dispatch)
+
+
+@contextmanager
+def collect_queries(collector):
+    """Передаёт ``collector.record(sql, ms)`` все запросы внутри блока."""
+    token = _collectors.set(_collectors.get() + (collector,))
+    try:
+        yield collector
+    finally:
+        _collectors.reset(token)
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def record(self, sql, duration):
+        self.count += 1
@@ -0,0 +1,77 @@
+"""Чтение из реплик PostgreSQL для безопасных запросов к API.
+
+На реплику идут только запросы к БД внутри GET/HEAD/OPTIONS к view с
+``ReplicaReadMixin``. Запись и чтение после записи в том же запросе
+обращаются к основной базе. Пользователь, который только что изменил
+данные, ещё ``REPLICA_STICKY_SECONDS`` секунд читает из основной базы и
+не видит отставания реплики.
+"""
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, connections
+
+_replica = ContextVar('replica_alias', default=None)
+
+
+def _sticky_key(user):
+    return f'replica-sticky:{user.pk}'
+
+
+def stick_to_primary(user):
+    """Направляет чтение пользователя в основную базу на время отставания."""
+    if settings.DATABASE_REPLICAS and user.is_authenticated:
+        caches[settings.REPLICA_STICKY_CACHE_ALIAS].set(
+            _sticky_key(user), True, settings.REPLICA_STICKY_SECONDS
+        )
+
+
+def use_replica(user):
+    """Включает чтение из случайной реплики до конца ``replica_reads``."""
+    if not settings.DATABASE_REPLICAS:
+        return
+    if user.is_authenticated and caches[
+        settings.REPLICA_STICKY_CACHE_ALIAS
+    ].get(_sticky_key(user)):
+        return
+    _replica.set(random.choice(settings.DATABASE_REPLICAS))
+
+
+def reading_from_replica():
+    return _replica.get() is not None
+
+
+@contextmanager
+def replica_reads():
+    """Ограничивает выбор реплики блоком: по умолчанию читается primary."""
+    token = _replica.set(None)
+    try:
+        yield
+    finally:
+        _replica.reset(token)
+
+
+class ReplicaRouter:
+
+    def db_for_read(self, model, **hints):
+        # Явный DEFAULT_DB_ALIAS: иначе Django читает связанные объекты
+        # из базы, откуда загружен исходный объект, то есть из реплики.
+        alias = _replica.get()
+        if alias is None or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return alias
+
+    def db_for_write(self, model, **hints):
+        # После записи запрос должен видеть свои изменения.
+        _replica.set(None)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Схема реплик приходит из основной базы через репликацию.
+        return db == DEFAULT_DB_ALIAS
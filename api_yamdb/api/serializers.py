@@ -1,11 +1,16 @@
 from datetime import datetime
 
+from django.conf import settings
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db.models import Avg
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.encoding import smart_str
 from rest_framework import serializers
 from rest_framework.exceptions import NotFound, ValidationError
-from rest_framework.generics import get_object_or_404
+from rest_framework.settings import api_settings
 from reviews.models import Category, Comment, Genre, Review, Title
+from reviews.signals import bulk_changed
 from users.models import User
 
 
@@ -27,34 +32,35 @@ class SignUpSerializer(serializers.Serializer):
     email = serializers.EmailField(max_length=254, required=True)
 
     def validate(self, attr):
+        """Проверяет занятость имени и email одним запросом к БД.
+
+        Если пользователь с такими же именем и email уже есть, он
+        сохраняется в ``existing_user`` и код подтверждения отправляется
+        ему повторно.
+        """
         username = attr['username']
         email = attr['email']
         if 'me' == username:
             raise serializers.ValidationError(
                 f'Извините, имя пользователя "{username}" недоступно.'
             )
-        if User.objects.filter(username=username, email=email).exists():
-            return attr
+        self.existing_user = None
+        errors = {}
+        for user in User.objects.filter(
+            Q(username=username) | Q(email=email)
+        )[:2]:
+            if user.username == username and user.email == email:
+                self.existing_user = user
+            elif user.email == email:
+                errors['email'] = [f'Извините, email: {email} недоступно.']
+            else:
+                errors['username'] = [
+                    f'Извините, имя пользователя {username} недоступно.'
+                ]
+        if errors:
+            raise serializers.ValidationError(errors)
         return attr
 
-    def validate_email(self, email):
-        req_username = self.initial_data.get('username')
-        if User.objects.filter(email=email).exists():
-            user_by_email = User.objects.get(email=email).username
-            if req_username != user_by_email:
-                raise serializers.ValidationError(
-                    f'Извините, email: {email} недоступно.')
-        return email
-
-    def validate_username(self, username):
-        req_email = self.initial_data['email']
-        if User.objects.filter(username=username).exists():
-            email = User.objects.get(username=username).email
-            if req_email != email:
-                raise serializers.ValidationError(
-                    f'Извините, имя пользователя {username} недоступно.')
-        return username
-
     def create(self, validated_data):
         return User.objects.create_user(**validated_data)
 
@@ -88,11 +94,9 @@ class ReviewSerializer(serializers.ModelSerializer):
 
     def validate(self, data):
         request = self.context['request']
-        author = request.user
-        title_id = self.context['view'].kwargs.get('title_id')
-        title = get_object_or_404(Title, pk=title_id)
         if request.method == 'POST':
-            if title.reviews.select_related('title').filter(author=author):
+            title = self.context['view'].get_title()
+            if title.reviews.filter(author=request.user).exists():
                 raise ValidationError('Только один отзыв!')
         return data
 
@@ -112,6 +116,132 @@ class CommentSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
 
+class PreloadedSlugRelatedField(serializers.SlugRelatedField):
+    """SlugRelatedField, берущий объекты из ``context['preloaded']``.
+
+    Пакетные сериализаторы загружают все упомянутые в запросе объекты
+    одним запросом на модель; без предзагрузки поле работает как обычно.
+    """
+
+    def to_internal_value(self, data):
+        preloaded = self.context.get('preloaded', {}).get(
+            self.get_queryset().model
+        )
+        if preloaded is None:
+            return super().to_internal_value(data)
+        try:
+            return preloaded[smart_str(data)]
+        except KeyError:
+            self.fail(
+                'does_not_exist', slug_name=self.slug_field,
+                value=smart_str(data),
+            )
+
+
+def insert_with_pks(model, objs):
+    """Пакетная вставка, после которой у объектов заполнены ключи.
+
+    SQLite в Django 3.2 не возвращает ключи из ``bulk_create``, поэтому
+    в нём строки сохраняются по одной через ``save()``. Их сигналы
+    сохранения повторяют то, что затем делает ``bulk_changed``.
+    """
+    if connection.features.can_return_rows_from_bulk_insert:
+        return model.objects.bulk_create(objs)
+    for obj in objs:
+        obj.save(force_insert=True)
+    return objs
+
+
+class BulkListSerializer(serializers.ListSerializer):
+    """Проверяет и записывает список объектов одним пакетом.
+
+    Ошибки возвращаются списком той же длины, что и запрос, с пустым
+    словарём для корректных элементов. Всё, что нужно для проверки
+    элементов, загружается заранее в ``preload`` одним запросом на
+    модель. Запись выполняется в транзакции view.
+    """
+    default_error_messages = {
+        'not_a_list': 'Ожидался список объектов, получен {input_type}.',
+        'empty': 'Список объектов не может быть пустым.',
+        'max_items': 'В одном запросе не больше {max_items} объектов.',
+    }
+
+    def preload(self, data):
+        """Загружает связанные и существующие объекты для ``data``."""
+
+    def validate_item(self, attrs, seen):
+        """Проверяет элемент относительно остальных элементов пакета."""
+
+    def to_internal_value(self, data):
+        if not isinstance(data, list):
+            self.fail_list('not_a_list', input_type=type(data).__name__)
+        if not data:
+            self.fail_list('empty')
+        max_items = settings.BULK_MAX_ITEMS
+        if len(data) > max_items:
+            self.fail_list('max_items', max_items=max_items)
+        self.preload([item for item in data if isinstance(item, dict)])
+        validated = []
+        errors = []
+        seen = set()
+        for item in data:
+            try:
+                attrs = self.child.run_validation(item)
+                self.validate_item(attrs, seen)
+            except ValidationError as exc:
+                errors.append(exc.detail)
+            else:
+                validated.append(attrs)
+                errors.append({})
+        if any(errors):
+            raise ValidationError(errors)
+        return validated
+
+    def fail_list(self, key, **kwargs):
+        raise ValidationError({api_settings.NON_FIELD_ERRORS_KEY: [
+            self.error_messages[key].format(**kwargs)
+        ]})
+
+
+class SlugBulkListSerializer(BulkListSerializer):
+    """Создаёт новые и переименовывает существующие объекты по slug."""
+
+    def preload(self, data):
+        self.instances = self.child.Meta.model.objects.in_bulk(
+            [smart_str(item.get('slug')) for item in data],
+            field_name='slug',
+        )
+
+    def validate_item(self, attrs, seen):
+        if attrs['slug'] in seen:
+            raise ValidationError(
+                {'slug': ['Значение повторяется в запросе.']}
+            )
+        seen.add(attrs['slug'])
+
+    def create(self, validated_data):
+        model = self.child.Meta.model
+        instances = []
+        created = []
+        updated = []
+        for attrs in validated_data:
+            instance = self.instances.get(attrs['slug'])
+            if instance is None:
+                instance = model(**attrs)
+                created.append(instance)
+            else:
+                instance.name = attrs['name']
+                updated.append(instance)
+            instances.append(instance)
+        model.objects.bulk_create(created)
+        model.objects.bulk_update(updated, ('name',))
+        # Новые объекты ещё не связаны с произведениями.
+        bulk_changed.send(
+            sender=model, pks=[instance.pk for instance in updated]
+        )
+        return instances
+
+
 class CategorySerializer(serializers.ModelSerializer):
 
     class Meta:
@@ -128,8 +258,23 @@ class GenreSerializer(serializers.ModelSerializer):
         exclude = ('id',)
 
 
+class CategoryBulkSerializer(CategorySerializer):
+
+    class Meta(CategorySerializer.Meta):
+        # Занятость slug проверяется одним запросом для всего пакета.
+        extra_kwargs = {'slug': {'validators': []}}
+        list_serializer_class = SlugBulkListSerializer
+
+
+class GenreBulkSerializer(GenreSerializer):
+
+    class Meta(GenreSerializer.Meta):
+        extra_kwargs = {'slug': {'validators': []}}
+        list_serializer_class = SlugBulkListSerializer
+
+
 class TitleReadSerializer(serializers.ModelSerializer):
-    rating = serializers.SerializerMethodField()
+    rating = serializers.FloatField(read_only=True)
     genre = GenreSerializer(many=True, read_only=True)
     category = CategorySerializer(read_only=True)
 
@@ -140,9 +285,16 @@ class TitleReadSerializer(serializers.ModelSerializer):
             'id', 'name', 'year', 'rating', 'description', 'genre', 'category',
         )
 
-    def get_rating(self, obj):
-        obj = obj.reviews.all().aggregate(rating=Avg('score'))
-        return obj['rating']
+
+class TitleRankingSerializer(TitleReadSerializer):
+    rating = serializers.FloatField(source='ranked_rating', read_only=True)
+    review_count = serializers.IntegerField(read_only=True)
+    recent_review_count = serializers.IntegerField(read_only=True)
+
+    class Meta(TitleReadSerializer.Meta):
+        fields = TitleReadSerializer.Meta.fields + (
+            'review_count', 'recent_review_count',
+        )
 
 
 class TitleWriteSerializer(serializers.ModelSerializer):
@@ -152,12 +304,12 @@ class TitleWriteSerializer(serializers.ModelSerializer):
             MaxValueValidator(datetime.now().year)
         ]
     )
-    genre = serializers.SlugRelatedField(
+    genre = PreloadedSlugRelatedField(
         slug_field="slug",
         many=True,
         queryset=Genre.objects.all(),
     )
-    category = serializers.SlugRelatedField(
+    category = PreloadedSlugRelatedField(
         slug_field="slug",
         queryset=Category.objects.all()
     )
@@ -167,3 +319,174 @@ class TitleWriteSerializer(serializers.ModelSerializer):
         fields = (
             'id', 'name', 'year', 'description', 'genre', 'category'
         )
+
+
+class TitleBulkListSerializer(BulkListSerializer):
+    """Создаёт произведения без ``id`` и обновляет произведения с ``id``.
+
+    Жанры и категории всех элементов загружаются двумя запросами, строки
+    произведений вставляются через ``bulk_create``, а связи с жанрами —
+    одной пакетной вставкой в промежуточную таблицу.
+    """
+
+    def preload(self, data):
+        genres = set()
+        categories = set()
+        ids = set()
+        for item in data:
+            if isinstance(item.get('genre'), list):
+                genres.update(smart_str(slug) for slug in item['genre'])
+            categories.add(smart_str(item.get('category')))
+            if isinstance(item.get('id'), int):
+                ids.add(item['id'])
+        self.context['preloaded'] = {
+            Genre: Genre.objects.in_bulk(genres, field_name='slug'),
+            Category: Category.objects.in_bulk(categories, field_name='slug'),
+        }
+        self.instances = Title.objects.in_bulk(ids)
+
+    def validate_item(self, attrs, seen):
+        title_id = attrs.get('id')
+        if title_id is None:
+            return
+        if title_id not in self.instances:
+            raise ValidationError(
+                {'id': [f'Произведение {title_id} не найдено.']}
+            )
+        if title_id in seen:
+            raise ValidationError({'id': ['Значение повторяется в запросе.']})
+        seen.add(title_id)
+
+    def create(self, validated_data):
+        fields = ('name', 'year', 'description', 'category')
+        now = timezone.now()
+        titles = []
+        created = []
+        updated = []
+        for attrs in validated_data:
+            title = self.instances.get(attrs.get('id')) or Title()
+            for field in fields:
+                setattr(title, field, attrs.get(field))
+            (created if title.pk is None else updated).append(title)
+            titles.append(title)
+        insert_with_pks(Title, created)
+        # bulk_update не обновляет auto_now, а поисковый индекс
+        # пересчитывается после записи для строк без него.
+        for title in updated:
+            title.modified = now
+            title.search_vector = None
+        Title.objects.bulk_update(
+            updated, fields + ('modified', 'search_vector')
+        )
+        through = Title.genre.through
+        if updated:
+            # QuerySet.delete() отправил бы post_delete на каждую связь;
+            # кеш и рейтинги обновляет один bulk_changed ниже.
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    'DELETE FROM {table} WHERE {column} IN ({params})'.format(
+                        table=connection.ops.quote_name(
+                            through._meta.db_table
+                        ),
+                        column=connection.ops.quote_name(
+                            through._meta.get_field('title').column
+                        ),
+                        params=', '.join(['%s'] * len(updated)),
+                    ),
+                    [title.pk for title in updated],
+                )
+        through.objects.bulk_create([
+            through(title_id=title.pk, genre_id=genre.pk)
+            for title, attrs in zip(titles, validated_data)
+            for genre in set(attrs['genre'])
+        ])
+        bulk_changed.send(sender=Title, pks=[title.pk for title in titles])
+        return titles
+
+
+class TitleBulkSerializer(TitleWriteSerializer):
+    id = serializers.IntegerField(required=False)
+
+    class Meta(TitleWriteSerializer.Meta):
+        list_serializer_class = TitleBulkListSerializer
+
+
+class ReviewBulkListSerializer(BulkListSerializer):
+    """Загружает отзывы партнёров одним пакетом.
+
+    Отзывы, уже оставленные автором к произведению, и повторы внутри
+    пакета пропускаются: занятые пары (произведение, автор) выбираются
+    одним запросом по индексу ограничения ``unique_review``. Если пару
+    успела занять параллельная вставка, пакет вставляется заново после
+    новой проверки, поэтому число созданных отзывов точное. Рейтинг
+    затронутых произведений пересчитывается один раз за пакет.
+    """
+    conflict_retries = 3
+
+    def preload(self, data):
+        title_ids = {smart_str(item.get('title')) for item in data}
+        usernames = {smart_str(item.get('author')) for item in data}
+        self.context['preloaded'] = {
+            Title: {
+                str(pk): title for pk, title in Title.objects.only(
+                    'id'
+                ).in_bulk(
+                    [title_id for title_id in title_ids if title_id.isdigit()]
+                ).items()
+            },
+            User: User.objects.only('id', 'username').in_bulk(
+                usernames, field_name='username'
+            ),
+        }
+
+    def taken_pairs(self, validated_data):
+        return set(Review.objects.filter(
+            title__in={attrs['title'] for attrs in validated_data},
+            author__in={attrs['author'] for attrs in validated_data},
+        ).values_list('title_id', 'author_id'))
+
+    def insert_new(self, validated_data):
+        taken = self.taken_pairs(validated_data)
+        reviews = []
+        for attrs in validated_data:
+            pair = (attrs['title'].pk, attrs['author'].pk)
+            if pair not in taken:
+                taken.add(pair)
+                reviews.append(Review(**attrs))
+        with transaction.atomic():
+            Review.objects.bulk_create(reviews)
+        return reviews
+
+    def create(self, validated_data):
+        for attempt in range(self.conflict_retries):
+            try:
+                reviews = self.insert_new(validated_data)
+                break
+            except IntegrityError:
+                if attempt == self.conflict_retries - 1:
+                    raise
+        self.skipped = len(validated_data) - len(reviews)
+        title_ids = {review.title_id for review in reviews}
+        Title.objects.filter(pk__in=title_ids).refresh_rating(
+            modified=timezone.now()
+        )
+        bulk_changed.send(sender=Review, title_ids=title_ids)
+        return reviews
+
+
+class ReviewBulkSerializer(serializers.ModelSerializer):
+    title = PreloadedSlugRelatedField(
+        slug_field='id',
+        queryset=Title.objects.all(),
+    )
+    author = PreloadedSlugRelatedField(
+        slug_field='username',
+        queryset=User.objects.all(),
+    )
+
+    class Meta:
+        model = Review
+        fields = ('title', 'author', 'text', 'score')
+        # Уникальность пары проверяется для всего пакета в create.
+        validators = []
+        list_serializer_class = ReviewBulkListSerializer
@@ -0,0 +1,42 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from reviews.models import Category, Genre, Review, Title, TitleRanking
+from reviews.signals import bulk_changed
+from users.models import User
+
+from .authentication import forget_user
+from .cache import invalidate
+
+# Изменение модели сбрасывает области целиком: например, любой отзыв
+# сбрасывает все закешированные списки произведений, а не только те, где
+# встречается его произведение.
+CATALOGUE_SCOPES = {
+    Category: ('categories', 'titles', 'rankings'),
+    Genre: ('genres', 'titles', 'rankings'),
+    Title: ('titles', 'rankings'),
+    Review: ('titles',),
+    Title.genre.through: ('titles', 'rankings'),
+    TitleRanking: ('rankings',),
+}
+
+
+def invalidate_catalogue_cache(sender, **kwargs):
+    invalidate(*CATALOGUE_SCOPES[sender])
+
+
+# Обработчик подключается только к моделям каталога: приёмник post_delete
+# без sender отключил бы быстрое удаление для всех моделей проекта.
+for model in CATALOGUE_SCOPES:
+    for signal in (post_save, post_delete, bulk_changed):
+        signal.connect(invalidate_catalogue_cache, sender=model)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def invalidate_title_genres_cache(sender, action, **kwargs):
+    if action.startswith('post_'):
+        invalidate('titles', 'rankings')
+
+
+@receiver((post_save, post_delete), sender=User)
+def forget_cached_user(sender, instance, **kwargs):
+    forget_user(instance.pk)
@@ -0,0 +1,120 @@
+"""Ограничение частоты запросов по области (scope) и роли пользователя.
+
+Счётчики хранятся в кеше ``THROTTLE_CACHE_ALIAS`` по фиксированным окнам:
+``cache.add`` и ``cache.incr`` атомарны в Redis, поэтому лимит общий для
+всех воркеров gunicorn. Идентификатор пользователя берётся из
+подписанного JWT, а роль — из снимка пользователя, который кеширует
+аутентификация (api/authentication.py); при промахе снимок загружается
+тем же запросом, что и при аутентификации. Лимиты проверяются до
+аутентификации, так что отклонённый запрос с закешированным снимком не
+выполняет ни одного SQL-запроса.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from users.models import User
+
+from .authentication import load_user
+
+ANONYMOUS = 'anonymous'
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_rate(rate):
+    """Разбирает частоту вида ``10/min`` в пару (лимит, окно в секундах)."""
+    limit, period = rate.split('/')
+    return int(limit), PERIODS[period[0]]
+
+
+def get_throttle_role(user_id):
+    # Роль в JWT устарела бы на весь срок жизни токена, а снимок
+    # сбрасывается при изменении пользователя.
+    user = load_user(user_id)
+    if user is None:
+        return User.USER
+    return User.ADMIN if user.is_superuser else user.role
+
+
+class RoleScopedRateThrottle(BaseThrottle):
+    """Лимит для ``view.throttle_scope`` с учётом роли пользователя.
+
+    Частота ищется в ``DEFAULT_THROTTLE_RATES`` по ключу ``scope.role``,
+    затем ``scope``; значение ``None`` снимает ограничение. Безопасные
+    методы не ограничиваются.
+    """
+    cache_format = 'throttle:{scope}:{ident}:{window}'
+    authentication = JWTAuthentication()
+
+    def allow_request(self, request, view):
+        scope = getattr(view, 'throttle_scope', None)
+        if (
+            scope is None
+            or not settings.THROTTLE_ENABLED
+            or request.method in SAFE_METHODS
+        ):
+            return True
+        ident, role = self.get_ident_and_role(request)
+        rate = self.get_rate(scope, role)
+        if rate is None:
+            return True
+        limit, duration = parse_rate(rate)
+        window = int(time.time() // duration)
+        self.wait_seconds = (window + 1) * duration - time.time()
+
+        cache = caches[settings.THROTTLE_CACHE_ALIAS]
+        key = self.cache_format.format(
+            scope=scope, ident=ident, window=window
+        )
+        cache.add(key, 0, duration)
+        try:
+            count = cache.incr(key)
+        except ValueError:
+            # Ключ истёк между add и incr: окно только что сменилось.
+            cache.add(key, 1, duration)
+            count = 1
+        return count <= limit
+
+    def get_ident_and_role(self, request):
+        header = self.authentication.get_header(request)
+        raw_token = header and self.authentication.get_raw_token(header)
+        if raw_token:
+            try:
+                token = self.authentication.get_validated_token(raw_token)
+            except (InvalidToken, TokenError):
+                pass
+            else:
+                user_id = token.get(jwt_settings.USER_ID_CLAIM)
+                return f'user:{user_id}', get_throttle_role(user_id)
+        return f'ip:{self.get_ident(request)}', ANONYMOUS
+
+    def get_rate(self, scope, role):
+        rates = api_settings.DEFAULT_THROTTLE_RATES
+        return rates.get(f'{scope}.{role}', rates.get(scope))
+
+    def wait(self):
+        return getattr(self, 'wait_seconds', None)
+
+
+class ThrottleFirstMixin:
+    """Проверяет лимиты до аутентификации и прав доступа.
+
+    Аутентификация по JWT загружает пользователя из БД, а лимиты нужны
+    как раз для того, чтобы лишние запросы до БД не доходили.
+    """
+
+    def initial(self, request, *args, **kwargs):
+        self.check_throttles(request)
+        self.throttles_checked = True
+        super().initial(request, *args, **kwargs)
+
+    def get_throttles(self):
+        if getattr(self, 'throttles_checked', False):
+            return []
+        return super().get_throttles()
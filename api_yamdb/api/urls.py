@@ -1,8 +1,10 @@
+from django.conf import settings
 from django.urls import include, path
 from rest_framework import routers
 
-from .views import (CategoryViewSet, CommentViewSet, GenreViewSet,
-                    ReviewViewSet, SignUpViewSet, TitleViewSet,
+from .async_views import with_async_views
+from .views import (CategoryViewSet, CommentViewSet, ExportView, GenreViewSet,
+                    ReviewBulkView, ReviewViewSet, SignUpViewSet, TitleViewSet,
                     TokenForUserView, UserViewSet)
 
 router_v1 = routers.DefaultRouter()
@@ -19,7 +21,17 @@ router_v1.register(r'genres', GenreViewSet, basename='genre')
 router_v1.register(r'categories', CategoryViewSet, basename='categories')
 router_v1.register(r'titles', TitleViewSet, basename='titles')
 
+router_urls = router_v1.urls
+if settings.ASYNC_VIEWS:
+    router_urls = with_async_views(router_urls)
+
 urlpatterns = [
-    path('v1/', include(router_v1.urls)),
-    path('v1/auth/token/', TokenForUserView.as_view(), name='auth_token')
+    path('v1/', include(router_urls)),
+    path('v1/auth/token/', TokenForUserView.as_view(), name='auth_token'),
+    path(
+        'v1/reviews/bulk/', ReviewBulkView.as_view(), name='reviews-bulk'
+    ),
+    path(
+        'v1/export/<slug:resource>/', ExportView.as_view(), name='export'
+    ),
 ]
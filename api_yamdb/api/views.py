@@ -1,53 +1,81 @@
+from functools import partial
+
 from django.conf import settings
 from django.contrib.auth.tokens import default_token_generator
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.http import FileResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters, mixins, status, viewsets
 from rest_framework.decorators import action
-from rest_framework.filters import OrderingFilter
-from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import (LimitOffsetPagination,
+                                       PageNumberPagination)
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.tokens import RefreshToken
-from reviews.models import Category, Genre, Review, Title
+from reviews.exporters import EXPORTERS, RENDERERS, export, spool
+from reviews.models import Category, Genre, Title
+from users.mail import enqueue_email
 from users.models import User
 
-from .filters import TitleFilter
-from .mixins import CategoryMixinViewSet
+from .cache import CachedListMixin, cached_response
+from .filters import RankingFilter, TitleFilter, TitleOrderingFilter
+from .mixins import (BulkWriteMixin, CategoryMixinViewSet, ConditionalGetMixin,
+                     NestedTitleReviewMixin, ReplicaReadMixin)
+from .pagination import ReviewCommentPagination, TitlePagination
 from .permissions import (IsAdminOrReadOnly, IsAdminOrSuperUser,
                           ReviewCommentPermission)
-from .serializers import (CategorySerializer, CommentSerializer,
-                          GenreSerializer, ReviewSerializer, SignUpSerializer,
+from .serializers import (CategoryBulkSerializer, CategorySerializer,
+                          CommentSerializer, GenreBulkSerializer,
+                          GenreSerializer, ReviewBulkSerializer,
+                          ReviewSerializer, SignUpSerializer,
+                          TitleBulkSerializer, TitleRankingSerializer,
                           TitleReadSerializer, TitleWriteSerializer,
                           TokenForUserSerializer, UserGetOrPatchSerializer,
                           UserSerializer)
+from .throttling import ThrottleFirstMixin
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(ThrottleFirstMixin, ReplicaReadMixin, ConditionalGetMixin,
+                    NestedTitleReviewMixin, viewsets.ModelViewSet):
     serializer_class = ReviewSerializer
     permission_classes = (ReviewCommentPermission,)
+    throttle_scope = 'reviews'
+    pagination_class = ReviewCommentPagination
+
+    def get_modified(self):
+        return self.get_title().modified, ''
 
     def get_queryset(self):
-        title = get_object_or_404(Title, id=self.kwargs['title_id'])
-        return title.reviews.all()
+        return self.get_title().reviews.select_related('author')
 
     def perform_create(self, serializer):
-        title = get_object_or_404(Title, id=self.kwargs['title_id'])
-        return serializer.save(author=self.request.user, title=title)
+        return serializer.save(
+            author=self.request.user, title=self.get_title()
+        )
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(ThrottleFirstMixin, ReplicaReadMixin,
+                     ConditionalGetMixin, NestedTitleReviewMixin,
+                     viewsets.ModelViewSet):
     serializer_class = CommentSerializer
     permission_classes = (ReviewCommentPermission,)
+    throttle_scope = 'comments'
+    pagination_class = ReviewCommentPagination
+
+    def get_modified(self):
+        return self.get_review().title.modified, ''
 
     def get_queryset(self):
-        review = get_object_or_404(Review, id=self.kwargs['review_id'])
-        return review.comments.all()
+        return self.get_review().comments.select_related('author')
 
     def perform_create(self, serializer):
-        review = get_object_or_404(Review, id=self.kwargs['review_id'])
-        return serializer.save(author=self.request.user, review=review)
+        return serializer.save(
+            author=self.request.user, review=self.get_review()
+        )
 
 
 class UserViewSet(viewsets.ModelViewSet):
@@ -69,7 +97,8 @@ class UserViewSet(viewsets.ModelViewSet):
         serializer_class=UserGetOrPatchSerializer
     )
     def get_or_edit_profile(self, request):
-        user = self.request.user
+        # request.user может быть снимком из кеша без полей профиля.
+        user = User.objects.get(pk=request.user.pk)
         if request.method == 'PATCH':
             serializer = self.get_serializer(
                 user, data=request.data, partial=True
@@ -81,36 +110,43 @@ class UserViewSet(viewsets.ModelViewSet):
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
-class SignUpViewSet(viewsets.GenericViewSet, mixins.CreateModelMixin):
+class SignUpViewSet(ThrottleFirstMixin, viewsets.GenericViewSet,
+                    mixins.CreateModelMixin):
     queryset = User.objects.all()
     serializer_class = SignUpSerializer
     permission_classes = (AllowAny,)
+    throttle_scope = 'signup'
 
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        email = serializer.validated_data['email']
         username = serializer.validated_data['username']
-
-        if User.objects.filter(email=email, username=username).exists():
-            return Response(
-                serializer.data,
-                status=status.HTTP_200_OK,
-            )
-        self.perform_create(serializer)
-        user_obj, _ = User.objects.get_or_create(**serializer.validated_data)
+        user_obj = serializer.existing_user
+        if user_obj is None:
+            try:
+                with transaction.atomic():
+                    user_obj = serializer.save()
+            except IntegrityError:
+                # Параллельный запрос успел зарегистрировать пользователя:
+                # повторная проверка вернёт его или ошибку занятости.
+                serializer = self.get_serializer(data=request.data)
+                serializer.is_valid(raise_exception=True)
+                user_obj = serializer.existing_user
+                if user_obj is None:
+                    raise
         confirmation_code = default_token_generator.make_token(user_obj)
-        user_obj.email_user(
+        enqueue_email(
             f'Hello {username}!',
             (
                 f'Здравствуйте {username}!'
                 f'Ваш код подтверждения!\n{confirmation_code}'),
-            settings.DEFAULT_FROM_EMAIL
+            user_obj.email,
         )
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
-class TokenForUserView(APIView):
+class TokenForUserView(ThrottleFirstMixin, APIView):
+    throttle_scope = 'token'
 
     def post(self, request):
         serializer = TokenForUserSerializer(data=request.data)
@@ -128,23 +164,129 @@ class TokenForUserView(APIView):
             status=status.HTTP_200_OK)
 
 
-class CategoryViewSet(CategoryMixinViewSet):
+class CategoryViewSet(ReplicaReadMixin, BulkWriteMixin, CachedListMixin,
+                      CategoryMixinViewSet):
+    cache_scopes = ('categories',)
     queryset = Category.objects.all().order_by('name')
     serializer_class = CategorySerializer
+    bulk_serializer_class = CategoryBulkSerializer
 
 
-class GenreViewSet(CategoryMixinViewSet):
+class GenreViewSet(ReplicaReadMixin, BulkWriteMixin, CachedListMixin,
+                   CategoryMixinViewSet):
+    cache_scopes = ('genres',)
     queryset = Genre.objects.all().order_by('name')
     serializer_class = GenreSerializer
+    bulk_serializer_class = GenreBulkSerializer
 
 
-class TitleViewSet(viewsets.ModelViewSet):
-    queryset = Title.objects.all().order_by('name')
+class TitleViewSet(ReplicaReadMixin, BulkWriteMixin, ConditionalGetMixin,
+                   CachedListMixin, viewsets.ModelViewSet):
+    cache_scopes = ('titles',)
+    conditional_scopes = ('titles',)
+    queryset = Title.objects.select_related(
+        'category'
+    ).prefetch_related('genre').order_by('name')
     permission_classes = (IsAdminOrReadOnly,)
-    filter_backends = (DjangoFilterBackend, OrderingFilter)
+    pagination_class = TitlePagination
+    filter_backends = (DjangoFilterBackend, TitleOrderingFilter)
     filterset_class = TitleFilter
+    ordering = ('name', 'id')
+    ordering_fields = ('name', 'year', 'rating', 'review_count')
+    bulk_serializer_class = TitleBulkSerializer
+
+    def get_object(self):
+        if not hasattr(self, '_object'):
+            self._object = super().get_object()
+        return self._object
+
+    def get_modified(self):
+        if self.action == 'retrieve':
+            return self.get_object().modified, ''
+        return super().get_modified()
 
     def get_serializer_class(self):
         if self.action in ("list", "retrieve"):
             return TitleReadSerializer
+        if self.action in ('top', 'trending'):
+            return TitleRankingSerializer
         return TitleWriteSerializer
+
+    def get_bulk_response_data(self, titles):
+        loaded = self.get_queryset().in_bulk([title.pk for title in titles])
+        return TitleReadSerializer(
+            [loaded[title.pk] for title in titles], many=True
+        ).data
+
+    def ranked_response(self, ordering):
+        queryset = Title.objects.filter(
+            ranking__review_count__gte=settings.RANKING['MIN_REVIEWS']
+        ).select_related('category').prefetch_related('genre').annotate(
+            ranked_rating=F('ranking__rating'),
+            review_count=F('ranking__review_count'),
+            recent_review_count=F('ranking__recent_review_count'),
+        ).order_by(*ordering)
+        queryset = RankingFilter(
+            self.request.query_params, queryset=queryset, request=self.request
+        ).qs
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @action(detail=False, pagination_class=PageNumberPagination)
+    def top(self, request):
+        """Произведения с наибольшим рейтингом из предрасчёта."""
+        return cached_response(request, ('rankings',), partial(
+            self.ranked_response, ('-ranked_rating', '-review_count', 'id')
+        ))
+
+    @action(detail=False, pagination_class=PageNumberPagination)
+    def trending(self, request):
+        """Произведения с наибольшим числом недавних отзывов."""
+        return cached_response(request, ('rankings',), partial(
+            self.ranked_response,
+            ('-recent_review_count', '-ranked_rating', 'id'),
+        ))
+
+
+class ReviewBulkView(ReplicaReadMixin, APIView):
+    """Пакетная загрузка отзывов от имени разных авторов."""
+    permission_classes = (IsAdminOrSuperUser,)
+
+    def post(self, request):
+        serializer = ReviewBulkSerializer(data=request.data, many=True)
+        with transaction.atomic():
+            serializer.is_valid(raise_exception=True)
+            reviews = serializer.save()
+        return Response(
+            {'created': len(reviews), 'skipped': serializer.skipped},
+            status=status.HTTP_201_CREATED,
+        )
+
+
+class ExportView(APIView):
+    permission_classes = (IsAdminOrSuperUser,)
+
+    def get(self, request, resource):
+        if resource not in EXPORTERS:
+            raise NotFound(f'Выгрузка {resource} не поддерживается.')
+        export_format = request.query_params.get('type', 'ndjson')
+        if export_format not in RENDERERS:
+            raise ValidationError(
+                {'type': f'Допустимые значения: {", ".join(RENDERERS)}.'}
+            )
+        content_type, _ = RENDERERS[export_format]
+        content = export(resource, export_format)
+        if settings.ASYNC_VIEWS:
+            # Под ASGI ответ читается в цикле событий, где ORM недоступен:
+            # выгрузка собирается во временный файл здесь, в потоке view.
+            response_class, content = FileResponse, spool(content)
+        else:
+            response_class = StreamingHttpResponse
+        response = response_class(
+            content, content_type=f'{content_type}; charset=utf-8',
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="{resource}.{export_format}"'
+        )
+        return response
@@ -19,6 +19,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'rest_framework',
     'rest_framework_simplejwt',
     'api',
@@ -28,6 +29,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api.middleware.MetricsMiddleware',
+    'api.middleware.SQLProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -68,10 +71,54 @@ DATABASES = {
         'USER': os.getenv('POSTGRES_USER', default='postgres'),
         'PASSWORD': os.getenv('POSTGRES_PASSWORD', default='12345'),
         'HOST': os.getenv('DB_HOST', default='db'),
-        'PORT': os.getenv('DB_PORT', default='5432')
+        'PORT': os.getenv('DB_PORT', default='5432'),
+        # Соединение живёт между запросами DB_CONN_MAX_AGE секунд;
+        # 0 — новое соединение на каждый запрос.
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', default=60)),
+        # PgBouncer в режиме transaction pooling не сохраняет курсоры
+        # между транзакциями, поэтому серверные курсоры отключаются.
+        'DISABLE_SERVER_SIDE_CURSORS': os.getenv('DB_PGBOUNCER', default='False') == 'True',
     }
 }
 
+# Реплики для чтения: DB_REPLICA_HOSTS=host1,host2:5433. Схема и данные
+# реплик приходят из основной базы через потоковую репликацию.
+DATABASE_REPLICAS = []
+for index, address in enumerate(filter(None, os.getenv('DB_REPLICA_HOSTS', default='').split(','))):
+    host, _, port = address.strip().partition(':')
+    DATABASES[f'replica_{index}'] = {
+        **DATABASES['default'],
+        'HOST': host,
+        'PORT': port or DATABASES['default']['PORT'],
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(f'replica_{index}')
+
+DATABASE_ROUTERS = ['api.routers.ReplicaRouter']
+
+# Сколько секунд после записи пользователь читает из основной базы.
+REPLICA_STICKY_SECONDS = int(os.getenv('DB_REPLICA_STICKY_SECONDS', default=5))
+
+REPLICA_STICKY_CACHE_ALIAS = 'default'
+
+# Перед первым обращением в запросе соединение, закрытое сервером БД или
+# PgBouncer, проверяется и открывается заново (CONN_HEALTH_CHECKS из Django 4.1).
+DB_CONN_HEALTH_CHECKS = os.getenv('DB_CONN_HEALTH_CHECKS', default='True') == 'True'
+
+
+# Cache
+
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', default='yamdb'),
+    }
+}
+
+API_CACHE_ALIAS = 'default'
+
+API_CACHE_TIMEOUT = int(os.getenv('API_CACHE_TIMEOUT', default=300))
+
 
 # Password validation
 
@@ -103,15 +150,86 @@ USE_L10N = True
 
 USE_TZ = True
 
+# Время жизни снимка пользователя для проверки прав по JWT; 0 отключает
+# кеш, и пользователь загружается из БД при каждом запросе.
+AUTH_USER_CACHE_TIMEOUT = int(os.getenv('AUTH_USER_CACHE_TIMEOUT', default=60))
+
 REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny',
     ],
     "DEFAULT_AUTHENTICATION_CLASSES": (
+        "api.authentication.CachedJWTAuthentication"
+        if AUTH_USER_CACHE_TIMEOUT else
         "rest_framework_simplejwt.authentication.JWTAuthentication",
     ),
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 5,
+    'DEFAULT_THROTTLE_CLASSES': [
+        'api.throttling.RoleScopedRateThrottle',
+    ],
+    # Ключ scope.role переопределяет частоту scope для роли,
+    # None снимает ограничение.
+    'DEFAULT_THROTTLE_RATES': {
+        'signup': os.getenv('THROTTLE_SIGNUP_RATE', default='5/hour'),
+        'token': os.getenv('THROTTLE_TOKEN_RATE', default='10/min'),
+        'reviews': os.getenv('THROTTLE_REVIEWS_RATE', default='20/hour'),
+        'reviews.moderator': None,
+        'reviews.admin': None,
+        'comments': os.getenv('THROTTLE_COMMENTS_RATE', default='60/hour'),
+        'comments.moderator': None,
+        'comments.admin': None,
+    },
+    # Число прокси перед приложением; клиент определяется по X-Forwarded-For.
+    'NUM_PROXIES': int(os.getenv('NUM_PROXIES', default=0)),
+}
+
+# Предрасчитанные рейтинги для /titles/top/ и /titles/trending/.
+RANKING = {
+    'TRENDING_DAYS': int(os.getenv('RANKING_TRENDING_DAYS', default=7)),
+    'MIN_REVIEWS': int(os.getenv('RANKING_MIN_REVIEWS', default=1)),
+    'BATCH_SIZE': int(os.getenv('RANKING_BATCH_SIZE', default=1000)),
+}
+
+# Наибольшее число объектов в запросе к эндпоинтам .../bulk/.
+BULK_MAX_ITEMS = int(os.getenv('BULK_MAX_ITEMS', default=1000))
+
+THROTTLE_ENABLED = os.getenv('THROTTLE_ENABLED', default='True') == 'True'
+
+# Счётчики лимитов должны жить в общем для воркеров кеше (Redis).
+THROTTLE_CACHE_ALIAS = 'default'
+
+SQL_PROFILING = {
+    'ENABLED': os.getenv('SQL_PROFILING_ENABLED', default='False') == 'True',
+    'SAMPLE_RATE': float(os.getenv('SQL_PROFILING_SAMPLE_RATE', default=0.05)),
+    'SLOW_QUERY_MS': float(os.getenv('SQL_PROFILING_SLOW_QUERY_MS', default=100)),
+    'REPEATED_QUERY_THRESHOLD': int(os.getenv('SQL_PROFILING_REPEATED_QUERY_THRESHOLD', default=5)),
+}
+
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', default='True') == 'True'
+
+METRICS_ACTIVE_USERS_WINDOW = int(os.getenv('METRICS_ACTIVE_USERS_WINDOW', default=300))
+
+# wsgi или asgi; в режиме asgi нагруженные эндпоинты чтения работают
+# через асинхронные view (см. api/async_views.py).
+SERVER_MODE = os.getenv('SERVER_MODE', default='wsgi')
+
+ASYNC_VIEWS = SERVER_MODE == 'asgi'
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'api': {
+            'handlers': ['console'],
+            'level': 'INFO',
+        },
+    },
 }
 
 SIMPLE_JWT = {
@@ -130,8 +248,17 @@ MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
 AUTH_USER_MODEL = 'users.User'
 
-EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+EMAIL_BACKEND = os.getenv('EMAIL_BACKEND', default='django.core.mail.backends.filebased.EmailBackend')
 
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
 
 DEFAULT_FROM_EMAIL = 'yourcode@yamdb.ru'
+
+# Очередь писем, которую разбирает команда send_emails.
+EMAIL_QUEUE = {
+    'BATCH_SIZE': int(os.getenv('EMAIL_QUEUE_BATCH_SIZE', default=50)),
+    'MAX_ATTEMPTS': int(os.getenv('EMAIL_QUEUE_MAX_ATTEMPTS', default=5)),
+    'RETRY_BACKOFF': int(os.getenv('EMAIL_QUEUE_RETRY_BACKOFF', default=30)),
+    'MAX_RETRY_DELAY': int(os.getenv('EMAIL_QUEUE_MAX_RETRY_DELAY', default=3600)),
+    'POLL_INTERVAL': float(os.getenv('EMAIL_QUEUE_POLL_INTERVAL', default=5)),
+}
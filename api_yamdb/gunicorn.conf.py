@@ -0,0 +1,31 @@
+import multiprocessing
+import os
+import shutil
+
+# SERVER_MODE=asgi запускает то же приложение через воркеры uvicorn.
+SERVER_MODE = os.environ.get('SERVER_MODE', 'wsgi')
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+workers = int(
+    os.environ.get('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1)
+)
+if SERVER_MODE == 'asgi':
+    wsgi_app = 'api_yamdb.asgi:application'
+    worker_class = 'uvicorn.workers.UvicornWorker'
+else:
+    wsgi_app = 'api_yamdb.wsgi:application'
+
+
+def on_starting(server):
+    # Файлы метрик прошлого запуска искажают суммы по воркерам.
+    path = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+    if path:
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path, exist_ok=True)
+
+
+def child_exit(server, worker):
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
@@ -2,9 +2,20 @@ from django.contrib import admin
 
 from .models import Category, Comment, Genre, GenreTitle, Review, Title
 
+
+class GenreTitleInline(admin.TabularInline):
+    model = GenreTitle
+    extra = 1
+
+
+@admin.register(Title)
+class TitleAdmin(admin.ModelAdmin):
+    # Поле с промежуточной моделью админка не показывает в форме.
+    inlines = (GenreTitleInline,)
+
+
 admin.site.register(Review)
 admin.site.register(Comment)
 admin.site.register(Category)
-admin.site.register(Title)
 admin.site.register(Genre)
 admin.site.register(GenreTitle)
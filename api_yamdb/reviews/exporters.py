@@ -0,0 +1,139 @@
+"""Потоковая выгрузка каталога в NDJSON и CSV.
+
+Строки читаются пакетами, поэтому потребление памяти не зависит от
+размера таблиц.
+"""
+import csv
+import json
+import tempfile
+from operator import attrgetter, itemgetter
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import Comment, Review, Title
+
+DEFAULT_CHUNK_SIZE = 2000
+# Сколько байт выгрузки держать в памяти, прежде чем перенести её на диск.
+SPOOL_MAX_SIZE = 8 * 1024 * 1024
+
+
+def keyset_chunks(queryset, chunk_size, key=attrgetter('pk')):
+    """Читает ``queryset`` пакетами по возрастанию первичного ключа.
+
+    Каждый пакет — отдельный запрос ``pk > последний`` с LIMIT, поэтому
+    память не зависит от размера таблицы и при отключённых серверных
+    курсорах (PgBouncer), когда ``iterator()`` загрузил бы всю выборку.
+    """
+    queryset = queryset.order_by('pk')
+    last_id = 0
+    while True:
+        chunk = list(queryset.filter(pk__gt=last_id)[:chunk_size])
+        if not chunk:
+            return
+        yield chunk
+        last_id = key(chunk[-1])
+
+
+def iter_titles(chunk_size=DEFAULT_CHUNK_SIZE):
+    # Жанры подгружаются одним запросом на пакет.
+    queryset = Title.objects.select_related('category').prefetch_related(
+        'genre'
+    )
+    for chunk in keyset_chunks(queryset, chunk_size):
+        for title in chunk:
+            yield {
+                'id': title.id,
+                'name': title.name,
+                'year': title.year,
+                'description': title.description,
+                'rating': title.rating,
+                'category': title.category.slug if title.category else None,
+                'genre': [genre.slug for genre in title.genre.all()],
+            }
+
+
+def iter_reviews(chunk_size=DEFAULT_CHUNK_SIZE):
+    for chunk in keyset_chunks(
+        Review.objects.values(
+            'id', 'title_id', 'author__username', 'text', 'score', 'pub_date'
+        ),
+        chunk_size,
+        key=itemgetter('id'),
+    ):
+        yield from chunk
+
+
+def iter_comments(chunk_size=DEFAULT_CHUNK_SIZE):
+    for chunk in keyset_chunks(
+        Comment.objects.values(
+            'id', 'review_id', 'author__username', 'text', 'pub_date'
+        ),
+        chunk_size,
+        key=itemgetter('id'),
+    ):
+        yield from chunk
+
+
+EXPORTERS = {
+    'titles': (
+        iter_titles,
+        ('id', 'name', 'year', 'description', 'rating', 'category', 'genre'),
+    ),
+    'reviews': (
+        iter_reviews,
+        ('id', 'title_id', 'author__username', 'text', 'score', 'pub_date'),
+    ),
+    'comments': (
+        iter_comments,
+        ('id', 'review_id', 'author__username', 'text', 'pub_date'),
+    ),
+}
+
+
+class Echo:
+    """Файлоподобный объект, возвращающий записанную строку."""
+
+    def write(self, value):
+        return value
+
+
+def render_ndjson(rows, fields):
+    for row in rows:
+        yield json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False) + '\n'
+
+
+def render_csv(rows, fields):
+    writer = csv.writer(Echo())
+    yield writer.writerow(fields)
+    for row in rows:
+        yield writer.writerow(
+            ','.join(value) if isinstance(value, list) else value
+            for value in (row[field] for field in fields)
+        )
+
+
+RENDERERS = {
+    'ndjson': ('application/x-ndjson', render_ndjson),
+    'csv': ('text/csv', render_csv),
+}
+
+
+def export(resource, export_format, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Возвращает генератор строк выгрузки ``resource`` в ``export_format``."""
+    iterate, fields = EXPORTERS[resource]
+    _, render = RENDERERS[export_format]
+    return render(iterate(chunk_size), fields)
+
+
+def spool(lines, max_size=SPOOL_MAX_SIZE):
+    """Записывает строки выгрузки во временный файл и перематывает его.
+
+    Нужен под ASGI: Django 3.2 читает StreamingHttpResponse в цикле
+    событий, где запросы ORM запрещены, поэтому выгрузка собирается
+    заранее в потоке view, а в цикле событий читается только файл.
+    """
+    buffer = tempfile.SpooledTemporaryFile(max_size=max_size)
+    for line in lines:
+        buffer.write(line.encode())
+    buffer.seek(0)
+    return buffer
@@ -0,0 +1,37 @@
+import sys
+
+from django.core.management.base import BaseCommand
+from reviews.exporters import DEFAULT_CHUNK_SIZE, EXPORTERS, RENDERERS, export
+
+
+class Command(BaseCommand):
+    help = 'Выгружает произведения, отзывы или комментарии в NDJSON или CSV.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('resource', choices=sorted(EXPORTERS))
+        parser.add_argument(
+            '--format',
+            dest='export_format',
+            choices=sorted(RENDERERS),
+            default='ndjson',
+        )
+        parser.add_argument(
+            '--output',
+            help='Файл для выгрузки, по умолчанию стандартный вывод.',
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE
+        )
+
+    def handle(self, *args, **options):
+        lines = export(
+            options['resource'],
+            options['export_format'],
+            options['chunk_size'],
+        )
+        if not options['output']:
+            sys.stdout.writelines(lines)
+            return
+        with open(options['output'], 'w', encoding='utf-8',
+                  newline='') as file:
+            file.writelines(lines)
@@ -0,0 +1,208 @@
+import csv
+import io
+import json
+import os
+import time
+from contextlib import contextmanager
+from itertools import islice
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from reviews.models import Category, Comment, Genre, Review, Title
+from reviews.signals import bulk_changed
+from users.models import User
+
+# Файлы загружаются в порядке зависимостей между таблицами.
+SOURCES = (
+    ('users', User),
+    ('category', Category),
+    ('genre', Genre),
+    ('titles', Title),
+    ('genre_title', Title.genre.through),
+    ('review', Review),
+    ('comments', Comment),
+)
+
+
+def read_rows(path):
+    with open(path, encoding='utf-8', newline='') as file:
+        if path.endswith('.jsonl'):
+            for line in file:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from csv.DictReader(file)
+
+
+def chunked(rows, size):
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+@contextmanager
+def keep_source_dates(model, columns):
+    """Не даёт auto_now_add перезаписать даты, взятые из файла."""
+    fields = [
+        field for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now_add', False) and field.name in columns
+    ]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+def copy_value(value):
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    return (
+        str(value).replace('\\', '\\\\').replace('\t', '\\t')
+        .replace('\n', '\\n').replace('\r', '\\r')
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        'Загружает данные из static/data/*.csv и *.jsonl пакетами. '
+        'Уже загруженные строки пропускаются, поэтому команду можно '
+        'перезапускать после сбоя.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path',
+            default=os.path.join(settings.BASE_DIR, 'static', 'data'),
+            help='Каталог с файлами данных.',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=1000,
+            help='Количество строк в одной пакетной вставке.',
+        )
+        parser.add_argument(
+            '--no-copy',
+            action='store_true',
+            help='Не использовать COPY даже при работе с PostgreSQL.',
+        )
+
+    def handle(self, *args, **options):
+        use_copy = (
+            connection.vendor == 'postgresql' and not options['no_copy']
+        )
+        for name, model in SOURCES:
+            for extension in ('csv', 'jsonl'):
+                path = os.path.join(options['path'], f'{name}.{extension}')
+                if os.path.exists(path):
+                    self.import_file(
+                        path, model, options['chunk_size'], use_copy
+                    )
+            bulk_changed.send(sender=model)
+        call_command('recalculate_ratings', stdout=self.stdout)
+
+    def import_file(self, path, model, chunk_size, use_copy):
+        started = time.monotonic()
+        total = 0
+        columns = None
+        for chunk in chunked(read_rows(path), chunk_size):
+            if columns is None:
+                columns = set(chunk[0])
+            objects = [self.build(model, row) for row in chunk]
+            with keep_source_dates(model, columns):
+                if use_copy:
+                    self.copy(model, objects)
+                else:
+                    model.objects.bulk_create(objects, ignore_conflicts=True)
+            total += len(objects)
+        self.reset_sequence(model)
+        elapsed = time.monotonic() - started
+        rate = total / elapsed if elapsed else total
+        self.stdout.write(
+            f'{os.path.basename(path)}: {total} строк за {elapsed:.2f} с '
+            f'({rate:.0f} строк/с)'
+        )
+
+    def build(self, model, row):
+        values = {}
+        for column, value in row.items():
+            try:
+                field = model._meta.get_field(column)
+            except FieldDoesNotExist:
+                raise CommandError(
+                    f'{model._meta.label}: неизвестное поле {column}'
+                )
+            values[field.attname] = value
+        return model(**values)
+
+    def copy(self, model, objects):
+        """Загружает пакет через COPY во временную таблицу.
+
+        Из временной таблицы строки переносятся в основную с пропуском
+        конфликтов, как при ``bulk_create(ignore_conflicts=True)``. Строки
+        без первичного ключа копируются отдельно и без его столбца, чтобы
+        ключ выдала последовательность основной таблицы.
+        """
+        pk = model._meta.pk
+        with_pk = [obj for obj in objects if obj.pk is not None]
+        without_pk = [obj for obj in objects if obj.pk is None]
+        fields = model._meta.concrete_fields
+        with transaction.atomic():
+            if with_pk:
+                self.copy_rows(model, fields, with_pk)
+            if without_pk:
+                self.copy_rows(
+                    model,
+                    [field for field in fields if field is not pk],
+                    without_pk,
+                )
+
+    def copy_rows(self, model, fields, objects):
+        table = connection.ops.quote_name(model._meta.db_table)
+        columns = ', '.join(
+            connection.ops.quote_name(field.column) for field in fields
+        )
+        buffer = io.StringIO()
+        for obj in objects:
+            buffer.write('\t'.join(
+                copy_value(field.get_db_prep_save(
+                    field.pre_save(obj, add=True), connection
+                ))
+                for field in fields
+            ))
+            buffer.write('\n')
+        buffer.seek(0)
+        with connection.cursor() as cursor:
+            cursor.execute('DROP TABLE IF EXISTS import_buffer')
+            # Только нужные столбцы и без ограничений: LIKE скопировал бы
+            # NOT NULL первичного ключа без его значения по умолчанию.
+            cursor.execute(
+                f'CREATE TEMP TABLE import_buffer ON COMMIT DROP AS '
+                f'SELECT {columns} FROM {table} WITH NO DATA'
+            )
+            cursor.copy_expert(
+                f'COPY import_buffer ({columns}) FROM STDIN', buffer
+            )
+            cursor.execute(
+                f'INSERT INTO {table} ({columns}) '
+                f'SELECT {columns} FROM import_buffer ON CONFLICT DO NOTHING'
+            )
+
+    def reset_sequence(self, model):
+        statements = connection.ops.sequence_reset_sql(no_style(), [model])
+        if statements:
+            with connection.cursor() as cursor:
+                for statement in statements:
+                    cursor.execute(statement)
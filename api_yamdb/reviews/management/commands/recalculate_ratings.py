@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+from reviews.models import Title
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает сохранённый рейтинг всех произведений.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Количество произведений, обновляемых одним запросом.',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        ids = Title.objects.order_by('pk').values_list('pk', flat=True)
+        updated = 0
+        last_id = 0
+        while True:
+            batch = list(ids.filter(pk__gt=last_id)[:batch_size])
+            if not batch:
+                break
+            last_id = batch[-1]
+            updated += Title.objects.filter(
+                pk__gte=batch[0], pk__lte=last_id
+            ).refresh_rating()
+        self.stdout.write(
+            self.style.SUCCESS(f'Обновлён рейтинг произведений: {updated}')
+        )
@@ -0,0 +1,46 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from reviews.models import TitleRanking
+from reviews.signals import bulk_changed
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает рейтинги произведений для /titles/top/ и '
+        '/titles/trending/: только помеченные изменением отзывов и те, '
+        'у которых есть недавние отзывы. С --interval работает как воркер.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help='Пересчитать рейтинги всех произведений.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=settings.RANKING['BATCH_SIZE'],
+            help='Количество произведений, пересчитываемых за один запрос.',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            help='Повторять пересчёт каждые INTERVAL секунд.',
+        )
+
+    def handle(self, *args, **options):
+        if options['full']:
+            TitleRanking.objects.mark_stale()
+        while True:
+            refreshed = TitleRanking.objects.refresh_due(
+                settings.RANKING['TRENDING_DAYS'], options['batch_size']
+            )
+            if refreshed:
+                bulk_changed.send(sender=TitleRanking)
+            self.stdout.write(f'Пересчитано рейтингов: {refreshed}')
+            if not options['interval']:
+                return
+            time.sleep(options['interval'])
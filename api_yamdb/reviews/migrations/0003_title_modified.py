@@ -0,0 +1,18 @@
+# Generated by Django 3.2 on 2026-10-18 17:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0002_title_rating'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='modified',
+            field=models.DateTimeField(auto_now=True, help_text='Обновляется при изменении произведения, отзывов к нему и комментариев', verbose_name='Дата изменения'),
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 3.2 on 2026-10-18 17:20
+
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+
+# GIN-индексы есть только в PostgreSQL, на остальных СУБД (SQLite в
+# тестах) поиск выполняется без них.
+CREATE_INDEXES = (
+    'CREATE INDEX IF NOT EXISTS reviews_title_search_idx '
+    'ON reviews_title USING gin (search_vector)',
+    'CREATE INDEX IF NOT EXISTS reviews_title_name_trgm_idx '
+    'ON reviews_title USING gin (name gin_trgm_ops)',
+)
+DROP_INDEXES = (
+    'DROP INDEX IF EXISTS reviews_title_search_idx',
+    'DROP INDEX IF EXISTS reviews_title_name_trgm_idx',
+)
+
+
+def create_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for statement in CREATE_INDEXES:
+        schema_editor.execute(statement)
+    Title = apps.get_model('reviews', 'Title')
+    Title.objects.update(
+        search_vector=SearchVector('name', weight='A', config='russian')
+        + SearchVector('description', weight='B', config='russian')
+    )
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for statement in DROP_INDEXES:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0003_title_modified'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='title',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True, verbose_name='Поисковый индекс'),
+        ),
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
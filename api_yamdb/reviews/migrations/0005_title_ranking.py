@@ -0,0 +1,56 @@
+# Generated by Django 3.2 on 2026-10-18 17:34
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def create_rankings(apps, schema_editor):
+    # Строки создаются помеченными, первый запуск refresh_rankings
+    # рассчитает их значения.
+    Title = apps.get_model('reviews', 'Title')
+    TitleRanking = apps.get_model('reviews', 'TitleRanking')
+    TitleRanking.objects.bulk_create(
+        [
+            TitleRanking(title_id=title_id)
+            for title_id in Title.objects.values_list('pk', flat=True)
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0004_title_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TitleRanking',
+            fields=[
+                ('title', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='ranking', serialize=False, to='reviews.title', verbose_name='Произведение')),
+                ('rating', models.FloatField(null=True, verbose_name='Рейтинг')),
+                ('review_count', models.PositiveIntegerField(default=0, verbose_name='Количество отзывов')),
+                ('recent_review_count', models.PositiveIntegerField(default=0, verbose_name='Отзывов за период популярности')),
+                ('stale', models.BooleanField(default=True, verbose_name='Требует пересчёта')),
+                ('refreshed', models.DateTimeField(null=True, verbose_name='Дата пересчёта')),
+            ],
+            options={
+                'verbose_name': 'Рейтинг произведения',
+                'verbose_name_plural': 'Рейтинги произведений',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='titleranking',
+            index=models.Index(fields=['-rating', '-review_count'], name='ranking_top_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='titleranking',
+            index=models.Index(fields=['-recent_review_count', '-rating'], name='ranking_trending_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='titleranking',
+            index=models.Index(condition=models.Q(stale=True), fields=['stale'], name='ranking_stale_idx'),
+        ),
+        migrations.RunPython(create_rankings, migrations.RunPython.noop),
+    ]
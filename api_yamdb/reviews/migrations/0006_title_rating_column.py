@@ -0,0 +1,54 @@
+# Generated by Django 3.2 on 2026-10-18 17:36
+
+from django.db import migrations, models
+from django.db.models import F, FloatField
+from django.db.models.functions import Cast, NullIf
+
+
+def fill_rating(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    Title.objects.update(
+        rating=Cast('rating_sum', FloatField()) / NullIf(F('rating_count'), 0)
+    )
+
+
+def create_desc_index(apps, schema_editor):
+    # Для ORDER BY rating DESC NULLS LAST в PostgreSQL нужен отдельный
+    # индекс: обратный обход (rating, id) ставит NULL первыми.
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS title_rating_desc_idx '
+        'ON reviews_title (rating DESC NULLS LAST, id DESC)'
+    )
+
+
+def drop_desc_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS title_rating_desc_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0005_title_ranking'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='rating',
+            field=models.FloatField(editable=False, help_text='Средняя оценка; пусто, пока нет отзывов', null=True, verbose_name='Рейтинг'),
+        ),
+        migrations.RunPython(fill_rating, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['rating', 'id'], name='title_rating_idx'),
+        ),
+        migrations.RunPython(create_desc_index, drop_desc_index),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['rating_count', 'id'], name='title_review_count_idx'),
+        ),
+    ]
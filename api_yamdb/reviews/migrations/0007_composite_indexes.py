@@ -0,0 +1,34 @@
+# Generated by Django 3.2 on 2026-10-18 17:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0006_title_rating_column'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['review', '-pub_date', '-id'], name='comment_review_pub_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['title', '-pub_date', '-id'], name='review_title_pub_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['category', 'year'], name='title_category_year_idx'),
+        ),
+        # Фильтр ?genre= соединяет произведения со связями по genre_id:
+        # индекс (genre_id, title_id) покрывает соединение без чтения
+        # таблицы. Автоматическая промежуточная таблица не описывается
+        # моделью, поэтому индекс создаётся SQL.
+        migrations.RunSQL(
+            'CREATE INDEX title_genre_genre_title_idx '
+            'ON reviews_title_genre (genre_id, title_id)',
+            'DROP INDEX title_genre_genre_title_idx',
+        ),
+    ]
@@ -0,0 +1,84 @@
+# Generated by Django 3.2 on 2026-10-18 17:52
+
+from django.db import migrations, models, transaction
+import django.db.models.deletion
+
+BATCH_SIZE = 1000
+
+
+def merge_genre_titles(apps, schema_editor):
+    """Переносит связи из reviews_genretitle в reviews_title_genre.
+
+    Каждый пакет записывается в своей транзакции, поэтому таблица связей
+    не блокируется на всё время переноса. Связи, которые уже есть в
+    таблице Title.genre, пропускаются.
+    """
+    OldGenreTitle = apps.get_model('reviews', 'GenreTitle')
+    Through = apps.get_model('reviews', 'Title').genre.through
+    using = schema_editor.connection.alias
+    last_id = 0
+    while True:
+        batch = list(
+            OldGenreTitle.objects.using(using).filter(
+                pk__gt=last_id
+            ).order_by('pk').values_list('pk', 'title_id', 'genre_id')[
+                :BATCH_SIZE
+            ]
+        )
+        if not batch:
+            return
+        with transaction.atomic(using=using):
+            Through.objects.using(using).bulk_create(
+                [
+                    Through(title_id=title_id, genre_id=genre_id)
+                    for _, title_id, genre_id in batch
+                ],
+                ignore_conflicts=True,
+            )
+        last_id = batch[-1][0]
+
+
+class Migration(migrations.Migration):
+    # Перенос идёт пакетами в отдельных транзакциях.
+    atomic = False
+
+    dependencies = [
+        ('reviews', '0007_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_genre_titles, migrations.RunPython.noop),
+        migrations.DeleteModel(
+            name='GenreTitle',
+        ),
+        # Таблица reviews_title_genre со всеми индексами уже есть:
+        # меняется только описание модели.
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name='GenreTitle',
+                    fields=[
+                        ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                        ('genre', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='reviews.genre', verbose_name='Жанр')),
+                        ('title', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='reviews.title', verbose_name='Произведение')),
+                    ],
+                    options={
+                        'verbose_name': 'Жанр произведения',
+                        'verbose_name_plural': 'Жанры произведений',
+                        'db_table': 'reviews_title_genre',
+                        'unique_together': {('title', 'genre')},
+                    },
+                ),
+                migrations.AlterField(
+                    model_name='title',
+                    name='genre',
+                    field=models.ManyToManyField(help_text='Выберите жанр', related_name='genre', through='reviews.GenreTitle', to='reviews.Genre', verbose_name='Жанр'),
+                ),
+                # Индекс создан SQL в 0007.
+                migrations.AddIndex(
+                    model_name='genretitle',
+                    index=models.Index(fields=['genre', 'title'], name='title_genre_genre_title_idx'),
+                ),
+            ],
+        ),
+    ]
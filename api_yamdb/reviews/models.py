@@ -1,5 +1,11 @@
+from datetime import timedelta
+
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import connection, models
+from django.db.models import Avg, Count, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
 from users.models import User
 
 
@@ -47,6 +53,45 @@ class Genre(models.Model):
         return self.name
 
 
+SEARCH_CONFIG = 'russian'
+
+
+class TitleQuerySet(models.QuerySet):
+    def refresh_search_vector(self):
+        """Обновляет полнотекстовый индекс названия и описания.
+
+        Поиск по индексу доступен только в PostgreSQL, для остальных СУБД
+        метод ничего не делает.
+        """
+        if connection.vendor != 'postgresql':
+            return 0
+        return self.update(
+            search_vector=SearchVector(
+                'name', weight='A', config=SEARCH_CONFIG
+            ) + SearchVector('description', weight='B', config=SEARCH_CONFIG)
+        )
+
+    def refresh_rating(self, **fields):
+        """Пересчитывает сохранённые сумму, количество и среднее оценок."""
+        reviews = Review.objects.filter(
+            title=OuterRef('pk')
+        ).order_by().values('title')
+        return self.update(
+            rating_sum=Coalesce(
+                Subquery(reviews.annotate(total=Sum('score')).values('total')),
+                0,
+            ),
+            rating_count=Coalesce(
+                Subquery(reviews.annotate(total=Count('id')).values('total')),
+                0,
+            ),
+            rating=Subquery(
+                reviews.annotate(average=Avg('score')).values('average')
+            ),
+            **fields,
+        )
+
+
 class Title(models.Model):
     name = models.CharField(
         max_length=50,
@@ -64,6 +109,7 @@ class Title(models.Model):
     )
     genre = models.ManyToManyField(
         Genre,
+        through='GenreTitle',
         related_name='genre',
         verbose_name='Жанр',
         help_text='Выберите жанр',
@@ -79,26 +125,87 @@ class Title(models.Model):
         help_text='Введите описание произведения',
         blank=True,
     )
+    rating_sum = models.PositiveIntegerField(
+        verbose_name='Сумма оценок',
+        default=0,
+        editable=False,
+    )
+    rating_count = models.PositiveIntegerField(
+        verbose_name='Количество оценок',
+        default=0,
+        editable=False,
+    )
+    rating = models.FloatField(
+        verbose_name='Рейтинг',
+        help_text='Средняя оценка; пусто, пока нет отзывов',
+        null=True,
+        editable=False,
+    )
+    modified = models.DateTimeField(
+        verbose_name='Дата изменения',
+        help_text='Обновляется при изменении произведения, отзывов к нему '
+                  'и комментариев',
+        auto_now=True,
+    )
+    search_vector = SearchVectorField(
+        verbose_name='Поисковый индекс',
+        null=True,
+        editable=False,
+    )
+
+    objects = TitleQuerySet.as_manager()
 
     class Meta:
         verbose_name = 'Заголовок'
         verbose_name_plural = 'Заголовки'
         ordering = ('-year',)
+        # Сортировки API ?ordering=rating и review_count. Индекс для
+        # -rating с NULLS LAST создаётся миграцией 0006 только в
+        # PostgreSQL: SQLite не поддерживает NULLS LAST в индексах и
+        # обходит для такой сортировки title_rating_idx в обратном порядке.
+        indexes = [
+            models.Index(fields=['rating', 'id'], name='title_rating_idx'),
+            models.Index(
+                fields=['rating_count', 'id'], name='title_review_count_idx'
+            ),
+            # Фильтр ?category=&year= списка произведений.
+            models.Index(
+                fields=['category', 'year'], name='title_category_year_idx'
+            ),
+        ]
 
     def __str__(self):
         return self.name
 
 
 class GenreTitle(models.Model):
+    """Связь произведения с жанром, промежуточная модель ``Title.genre``."""
     genre = models.ForeignKey(
         Genre,
         on_delete=models.CASCADE,
+        verbose_name='Жанр',
     )
     title = models.ForeignKey(
         Title,
         on_delete=models.CASCADE,
+        verbose_name='Произведение',
     )
 
+    class Meta:
+        # Таблица и уникальный индекс (title, genre) остались от
+        # автоматической промежуточной модели, поэтому при переходе на
+        # GenreTitle индекс не перестраивается.
+        db_table = 'reviews_title_genre'
+        unique_together = (('title', 'genre'),)
+        verbose_name = 'Жанр произведения'
+        verbose_name_plural = 'Жанры произведений'
+        indexes = [
+            # Фильтр ?genre= списка произведений.
+            models.Index(
+                fields=['genre', 'title'], name='title_genre_genre_title_idx'
+            ),
+        ]
+
     def __str__(self):
         return (
             f'Жанр - {self.genre} произведения - {self.title}'
@@ -150,6 +257,13 @@ class Review(models.Model):
                 name='unique_review'
             )
         ]
+        indexes = [
+            # Отзывы произведения в порядке страниц и курсора API.
+            models.Index(
+                fields=['title', '-pub_date', '-id'],
+                name='review_title_pub_date_idx',
+            ),
+        ]
 
 
 class Comment(models.Model):
@@ -179,3 +293,149 @@ class Comment(models.Model):
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
         ordering = ('-pub_date',)
+        indexes = [
+            models.Index(
+                fields=['review', '-pub_date', '-id'],
+                name='comment_review_pub_date_idx',
+            ),
+        ]
+
+
+class TitleRankingQuerySet(models.QuerySet):
+    def mark_stale(self, title_ids=None):
+        """Помечает строки произведений ``title_ids`` для пересчёта.
+
+        Без ``title_ids`` помечаются все строки, а для произведений,
+        добавленных пакетной вставкой, создаются недостающие.
+        """
+        if title_ids is not None:
+            return self.filter(pk__in=title_ids).update(stale=True)
+        self.update(stale=True)
+        missing = Title.objects.filter(
+            ranking__isnull=True
+        ).values_list('pk', flat=True)
+        self.bulk_create(
+            [TitleRanking(title_id=title_id) for title_id in missing],
+            batch_size=1000,
+            ignore_conflicts=True,
+        )
+
+    def due(self):
+        """Строки, требующие пересчёта: помеченные и с недавними отзывами.
+
+        Вторые пересчитываются всегда, потому что старые отзывы выходят
+        из окна популярности без изменения данных.
+        """
+        return self.filter(
+            models.Q(stale=True) | models.Q(recent_review_count__gt=0)
+        )
+
+    def refresh(self, title_ids, trending_days):
+        """Пересчитывает рейтинг и популярность для ``title_ids``.
+
+        Отметка ``stale`` снимается до чтения отзывов, поэтому изменение
+        отзыва во время пересчёта снова пометит строку.
+        """
+        now = timezone.now()
+        self.filter(pk__in=title_ids).update(stale=False)
+        stats = {
+            row['title_id']: row
+            for row in Review.objects.filter(
+                title_id__in=title_ids
+            ).order_by().values('title_id').annotate(
+                rating=Avg('score'),
+                review_count=Count('id'),
+                recent_review_count=Count('id', filter=models.Q(
+                    pub_date__gte=now - timedelta(days=trending_days)
+                )),
+            )
+        }
+        empty = {'rating': None, 'review_count': 0, 'recent_review_count': 0}
+        self.bulk_update(
+            [
+                TitleRanking(
+                    title_id=title_id,
+                    rating=stats.get(title_id, empty)['rating'],
+                    review_count=stats.get(title_id, empty)['review_count'],
+                    recent_review_count=stats.get(
+                        title_id, empty
+                    )['recent_review_count'],
+                    refreshed=now,
+                )
+                for title_id in title_ids
+            ],
+            ('rating', 'review_count', 'recent_review_count', 'refreshed'),
+        )
+
+    def refresh_due(self, trending_days, batch_size=1000):
+        """Пересчитывает все строки из due() пакетами по ``batch_size``."""
+        refreshed = 0
+        last_id = 0
+        while True:
+            batch = list(self.due().filter(pk__gt=last_id).order_by(
+                'pk'
+            ).values_list('pk', flat=True)[:batch_size])
+            if not batch:
+                return refreshed
+            self.refresh(batch, trending_days)
+            refreshed += len(batch)
+            last_id = batch[-1]
+
+
+class TitleRanking(models.Model):
+    """Предрасчитанные рейтинг и популярность произведения.
+
+    Строки пересчитываются командой refresh_rankings: изменение отзыва
+    только помечает строку произведения как устаревшую.
+    """
+    title = models.OneToOneField(
+        Title,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='ranking',
+        verbose_name='Произведение',
+    )
+    rating = models.FloatField(
+        verbose_name='Рейтинг',
+        null=True,
+    )
+    review_count = models.PositiveIntegerField(
+        verbose_name='Количество отзывов',
+        default=0,
+    )
+    recent_review_count = models.PositiveIntegerField(
+        verbose_name='Отзывов за период популярности',
+        default=0,
+    )
+    stale = models.BooleanField(
+        verbose_name='Требует пересчёта',
+        default=True,
+    )
+    refreshed = models.DateTimeField(
+        verbose_name='Дата пересчёта',
+        null=True,
+    )
+
+    objects = TitleRankingQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = 'Рейтинг произведения'
+        verbose_name_plural = 'Рейтинги произведений'
+        indexes = [
+            models.Index(
+                fields=['-rating', '-review_count'],
+                name='ranking_top_idx',
+            ),
+            models.Index(
+                fields=['-recent_review_count', '-rating'],
+                name='ranking_trending_idx',
+            ),
+            models.Index(
+                fields=['stale'],
+                name='ranking_stale_idx',
+                condition=models.Q(stale=True),
+            ),
+        ]
+
+    def __str__(self):
+        return f'Рейтинг {self.title_id}: {self.rating}'
@@ -0,0 +1,127 @@
+from django.db.models import F, FloatField
+from django.db.models.functions import Cast, NullIf
+from django.db.models.signals import (m2m_changed, post_delete, post_save,
+                                      pre_delete)
+from django.dispatch import Signal, receiver
+from django.utils import timezone
+
+from .models import Category, Comment, Genre, Review, Title, TitleRanking
+
+# Отправляется после пакетной записи (bulk_create, COPY), при которой
+# сигналы сохранения отдельных объектов не срабатывают. Необязательный
+# аргумент pks перечисляет ключи записанных объектов, а title_ids для
+# отзывов — произведения, к которым они относятся; без них изменёнными
+# считаются все.
+bulk_changed = Signal()
+
+
+@receiver(post_save, sender=Review)
+def update_rating_on_save(sender, instance, created, raw, **kwargs):
+    if raw:
+        return
+    titles = Title.objects.filter(pk=instance.title_id)
+    if created:
+        # В правой части UPDATE поля имеют значения до изменения.
+        titles.update(
+            rating_sum=F('rating_sum') + instance.score,
+            rating_count=F('rating_count') + 1,
+            rating=Cast(
+                F('rating_sum') + instance.score, FloatField()
+            ) / (F('rating_count') + 1),
+            modified=timezone.now(),
+        )
+    else:
+        titles.refresh_rating(modified=timezone.now())
+
+
+@receiver(post_delete, sender=Review)
+def update_rating_on_delete(sender, instance, **kwargs):
+    Title.objects.filter(pk=instance.title_id, rating_count__gt=0).update(
+        rating_sum=F('rating_sum') - instance.score,
+        rating_count=F('rating_count') - 1,
+        rating=Cast(
+            F('rating_sum') - instance.score, FloatField()
+        ) / NullIf(F('rating_count') - 1, 0),
+        modified=timezone.now(),
+    )
+
+
+@receiver((post_save, post_delete), sender=Comment)
+def touch_title_on_comment_change(sender, instance, raw=False, **kwargs):
+    if not raw:
+        Title.objects.filter(reviews=instance.review_id).update(
+            modified=timezone.now()
+        )
+
+
+@receiver(post_save, sender=Genre)
+@receiver(pre_delete, sender=Genre)
+def touch_titles_on_genre_change(sender, instance, raw=False, **kwargs):
+    if not raw:
+        Title.objects.filter(genre=instance).update(modified=timezone.now())
+
+
+@receiver(post_save, sender=Category)
+@receiver(pre_delete, sender=Category)
+def touch_titles_on_category_change(sender, instance, raw=False, **kwargs):
+    if not raw:
+        Title.objects.filter(category=instance).update(modified=timezone.now())
+
+
+@receiver(bulk_changed, sender=Genre)
+@receiver(bulk_changed, sender=Category)
+def touch_titles_after_bulk(sender, pks=None, **kwargs):
+    titles = Title.objects.all()
+    if pks is not None:
+        titles = titles.filter(**{f'{sender._meta.model_name}__in': pks})
+    titles.update(modified=timezone.now())
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def touch_title_on_genre_set(sender, instance, action, reverse, pk_set,
+                             **kwargs):
+    if not action.startswith('post_'):
+        return
+    if reverse:
+        titles = Title.objects.filter(pk__in=pk_set or ())
+    else:
+        titles = Title.objects.filter(pk=instance.pk)
+    titles.update(modified=timezone.now())
+
+
+@receiver(post_save, sender=Title)
+def update_search_vector(sender, instance, raw, **kwargs):
+    if not raw:
+        Title.objects.filter(pk=instance.pk).refresh_search_vector()
+
+
+@receiver(bulk_changed, sender=Title)
+def update_search_vectors_after_bulk(sender, **kwargs):
+    Title.objects.filter(search_vector__isnull=True).refresh_search_vector()
+
+
+@receiver(post_save, sender=Title)
+def create_title_ranking(sender, instance, created, raw, **kwargs):
+    if created and not raw:
+        TitleRanking.objects.create(title=instance, stale=False)
+
+
+@receiver((post_save, post_delete), sender=Review)
+def mark_ranking_stale(sender, instance, raw=False, **kwargs):
+    if not raw:
+        TitleRanking.objects.mark_stale([instance.title_id])
+
+
+@receiver(bulk_changed, sender=Title)
+@receiver(bulk_changed, sender=Review)
+def mark_rankings_stale_after_bulk(sender, pks=None, title_ids=None,
+                                   **kwargs):
+    if sender is Title and pks is not None:
+        # Изменение произведений не влияет на рейтинги: нужны только
+        # строки для новых произведений.
+        TitleRanking.objects.bulk_create(
+            [TitleRanking(title_id=pk, stale=False) for pk in pks],
+            ignore_conflicts=True,
+        )
+        return
+    TitleRanking.objects.mark_stale(title_ids)
@@ -1,5 +1,12 @@
 from django.contrib import admin
 
-from .models import User
+from .models import OutboundEmail, User
 
 admin.site.register(User)
+
+
+@admin.register(OutboundEmail)
+class OutboundEmailAdmin(admin.ModelAdmin):
+    list_display = ('to', 'subject', 'status', 'attempts', 'next_attempt_at')
+    list_filter = ('status',)
+    search_fields = ('to',)
@@ -0,0 +1,79 @@
+"""Очередь исходящих писем.
+
+Письма сохраняются в таблицу ``OutboundEmail`` и отправляются командой
+``send_emails`` пакетами через одно соединение с почтовым сервером.
+Неудачная отправка повторяется с экспоненциально растущей паузой.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from .models import OutboundEmail
+
+
+def enqueue_email(subject, body, to, from_email=None):
+    return OutboundEmail.objects.create(
+        subject=subject,
+        body=body,
+        to=to,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+    )
+
+
+def retry_delay(attempts):
+    config = settings.EMAIL_QUEUE
+    return timedelta(seconds=min(
+        config['RETRY_BACKOFF'] * 2 ** (attempts - 1),
+        config['MAX_RETRY_DELAY'],
+    ))
+
+
+def send_pending(batch_size=None):
+    """Отправляет пакет писем, срок отправки которых наступил.
+
+    Строки пакета блокируются до конца отправки, а занятые другим
+    воркером пропускаются (``skip_locked``), поэтому воркеров может быть
+    несколько. Возвращает пару ``(отправлено, ошибок)``.
+    """
+    config = settings.EMAIL_QUEUE
+    batch_size = batch_size or config['BATCH_SIZE']
+    sent = failed = 0
+    with transaction.atomic():
+        emails = list(
+            OutboundEmail.objects.select_for_update(skip_locked=True).filter(
+                status=OutboundEmail.PENDING,
+                next_attempt_at__lte=timezone.now(),
+            ).order_by('next_attempt_at', 'id')[:batch_size]
+        )
+        if not emails:
+            return sent, failed
+        with get_connection() as connection:
+            for email in emails:
+                message = EmailMessage(
+                    email.subject, email.body, email.from_email, [email.to],
+                    connection=connection,
+                )
+                email.attempts += 1
+                try:
+                    message.send()
+                except Exception as error:
+                    failed += 1
+                    email.last_error = repr(error)
+                    if email.attempts >= config['MAX_ATTEMPTS']:
+                        email.status = OutboundEmail.FAILED
+                    else:
+                        email.next_attempt_at = (
+                            timezone.now() + retry_delay(email.attempts)
+                        )
+                else:
+                    sent += 1
+                    email.status = OutboundEmail.SENT
+                    email.sent_at = timezone.now()
+        OutboundEmail.objects.bulk_update(
+            emails,
+            ('status', 'attempts', 'next_attempt_at', 'last_error', 'sent_at'),
+        )
+    return sent, failed
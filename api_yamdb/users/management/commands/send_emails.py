@@ -0,0 +1,51 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from users.mail import send_pending
+
+
+class Command(BaseCommand):
+    help = (
+        'Отправляет письма из очереди OutboundEmail пакетами. Без --once '
+        'работает как воркер и проверяет очередь каждые --interval секунд.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=settings.EMAIL_QUEUE['BATCH_SIZE'],
+            help='Количество писем, отправляемых через одно соединение.',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=settings.EMAIL_QUEUE['POLL_INTERVAL'],
+            help='Пауза в секундах, когда очередь пуста.',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Отправить все готовые письма и завершиться.',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            try:
+                sent, failed = send_pending(options['batch_size'])
+            except Exception as error:
+                # Почтовый сервер недоступен: пакет остаётся в очереди.
+                if options['once']:
+                    raise
+                self.stderr.write(f'Ошибка соединения: {error!r}')
+                time.sleep(options['interval'])
+                continue
+            if sent or failed:
+                self.stdout.write(
+                    f'Отправлено: {sent}, ошибок: {failed}'
+                )
+            if sent + failed < options['batch_size']:
+                if options['once']:
+                    return
+                time.sleep(options['interval'])
@@ -1,5 +1,6 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.utils import timezone
 
 
 class User(AbstractUser):
@@ -35,3 +36,47 @@ class User(AbstractUser):
 
     def __str__(self):
         return self.username
+
+
+class OutboundEmail(models.Model):
+    """Письмо в очереди на отправку командой send_emails."""
+    PENDING = 'pending'
+    SENT = 'sent'
+    FAILED = 'failed'
+    STATUSES = (
+        (PENDING, 'Ожидает отправки'),
+        (SENT, 'Отправлено'),
+        (FAILED, 'Не отправлено'),
+    )
+
+    subject = models.CharField('Тема', max_length=255)
+    body = models.TextField('Текст')
+    from_email = models.CharField('Отправитель', max_length=254)
+    to = models.EmailField('Получатель')
+    status = models.CharField(
+        'Статус',
+        max_length=max(len(status) for status, none_ in STATUSES),
+        choices=STATUSES,
+        default=PENDING,
+    )
+    attempts = models.PositiveSmallIntegerField('Попытки', default=0)
+    next_attempt_at = models.DateTimeField(
+        'Следующая попытка', default=timezone.now
+    )
+    last_error = models.TextField('Последняя ошибка', blank=True)
+    created = models.DateTimeField('Создано', auto_now_add=True)
+    sent_at = models.DateTimeField('Отправлено', null=True, blank=True)
+
+    class Meta:
+        verbose_name = 'Исходящее письмо'
+        verbose_name_plural = 'Исходящие письма'
+        ordering = ('id',)
+        indexes = [
+            models.Index(
+                fields=['status', 'next_attempt_at'],
+                name='outbound_email_queue_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.to}: {self.subject}'
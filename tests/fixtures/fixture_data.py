@@ -0,0 +1,34 @@
+import pytest
+
+
+@pytest.fixture
+def catalogue(django_user_model):
+    """Несколько произведений с жанрами, отзывами и комментариями."""
+    from reviews.models import Category, Comment, Genre, Review, Title
+
+    category = Category.objects.create(name='Фильм', slug='movie')
+    genres = [
+        Genre.objects.create(name=f'Жанр {i}', slug=f'genre-{i}')
+        for i in range(3)
+    ]
+    authors = [
+        django_user_model.objects.create_user(
+            username=f'author{i}', email=f'author{i}@yamdb.fake'
+        )
+        for i in range(3)
+    ]
+    titles = []
+    for i in range(12):
+        title = Title.objects.create(
+            name=f'Произведение {i}', year=2000 + i, category=category
+        )
+        title.genre.set(genres[:i % 3 + 1])
+        for score, author in enumerate(authors, start=i % 5 + 1):
+            review = Review.objects.create(
+                title=title, author=author, text='Отзыв', score=score
+            )
+            Comment.objects.create(
+                review=review, author=author, text='Комментарий'
+            )
+        titles.append(title)
+    return titles
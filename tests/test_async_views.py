@@ -0,0 +1,101 @@
+import json
+
+import pytest
+from asgiref.sync import async_to_sync
+from rest_framework.test import APIRequestFactory
+
+
+def asgi_get(path, token):
+    """Выполняет GET через ASGI-приложение и возвращает статус и тело."""
+    from django.core.asgi import get_asgi_application
+
+    application = get_asgi_application()
+    scope = {
+        'type': 'http',
+        'method': 'GET',
+        'path': path,
+        'query_string': b'',
+        'headers': [(b'authorization', f'Bearer {token}'.encode())],
+    }
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    async_to_sync(application)(scope, receive, send)
+    status = next(
+        message['status'] for message in messages
+        if message['type'] == 'http.response.start'
+    )
+    body = b''.join(
+        message.get('body', b'') for message in messages
+        if message['type'] == 'http.response.body'
+    )
+    return status, body
+
+
+def get_async_view(name):
+    from api.async_views import with_async_views
+    from api.urls import router_v1
+
+    return next(
+        pattern.callback for pattern in with_async_views(router_v1.urls)
+        if pattern.name == name
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+class TestAsyncViews:
+
+    def test_async_title_list(self, client, catalogue):
+        from api.queries import QueryCounter, collect_queries
+
+        view = get_async_view('titles-list')
+        request = APIRequestFactory().get('/api/v1/titles/')
+        with collect_queries(QueryCounter()) as queries:
+            response = async_to_sync(view)(request)
+        assert response.status_code == 200
+        assert json.loads(response.content) == client.get(
+            '/api/v1/titles/'
+        ).json(), (
+            'Проверьте, что асинхронный view отдаёт тот же ответ'
+        )
+        assert queries.count >= 1, (
+            'Проверьте, что запросы из потока пула учитываются сборщиком'
+        )
+
+    def test_async_middleware(self, settings, async_client, catalogue):
+        settings.SQL_PROFILING = {
+            'ENABLED': True,
+            'SAMPLE_RATE': 1.0,
+            'SLOW_QUERY_MS': 10000,
+            'REPEATED_QUERY_THRESHOLD': 5,
+        }
+        response = async_to_sync(async_client.get)('/api/v1/genres/')
+        assert response.status_code == 200
+        assert 'desc="0 queries"' not in response['Server-Timing'], (
+            'Проверьте, что в режиме ASGI middleware учитывает запросы к БД'
+        )
+
+    def test_load_test(self, live_server, catalogue):
+        from api.benchmark import run_load_test
+
+        url = f'{live_server.url}/api/v1/genres/'
+        results = run_load_test([url], concurrency=4, requests=20)
+        assert results[url]['errors'] == 0
+        assert results[url]['rps'] > 0
+
+    def test_asgi_export(self, settings, admin, catalogue):
+        from rest_framework_simplejwt.tokens import RefreshToken
+        from reviews.models import Review
+
+        settings.ASYNC_VIEWS = True
+        token = RefreshToken.for_user(admin).access_token
+        status, body = asgi_get('/api/v1/export/reviews/', token)
+        assert status == 200
+        assert len(body.splitlines()) == Review.objects.count(), (
+            'Проверьте, что в режиме ASGI выгрузка отдаётся целиком'
+        )
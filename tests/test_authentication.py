@@ -0,0 +1,49 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def user_queries(queries):
+    return [
+        query['sql'] for query in queries
+        if 'FROM "users_user"' in query['sql']
+    ]
+
+
+@pytest.mark.django_db
+class TestCachedJWTAuthentication:
+
+    def test_repeated_request_skips_user_query(self, user_client, catalogue):
+        url = f'/api/v1/titles/{catalogue[0].pk}/reviews/'
+        user_client.get(url)
+        with CaptureQueriesContext(connection) as queries:
+            response = user_client.get(url)
+        assert response.status_code == 200
+        assert user_queries(queries) == [], (
+            'Проверьте, что пользователь из JWT берётся из кеша'
+        )
+
+    def test_role_change_invalidates_snapshot(self, user, user_client,
+                                              catalogue):
+        response = user_client.delete(f'/api/v1/genres/{"genre-0"}/')
+        assert response.status_code == 403
+        user.role = 'admin'
+        user.save()
+        response = user_client.delete(f'/api/v1/genres/{"genre-0"}/')
+        assert response.status_code == 204, (
+            'Проверьте, что сохранение пользователя сбрасывает снимок в кеше'
+        )
+
+    def test_inactive_user_is_rejected(self, user, user_client):
+        user_client.get('/api/v1/users/me/')
+        user.is_active = False
+        user.save()
+        assert user_client.get('/api/v1/users/me/').status_code == 401
+
+    def test_profile_returns_full_user(self, user, user_client):
+        user.bio = 'Биография'
+        user.save()
+        user_client.get('/api/v1/users/me/')
+        response = user_client.get('/api/v1/users/me/')
+        assert response.json()['bio'] == 'Биография'
+        assert response.json()['email'] == user.email
@@ -0,0 +1,52 @@
+import pytest
+
+
+@pytest.mark.django_db
+class TestBenchmark:
+
+    def test_benchmark_covers_router(self):
+        from api.benchmark import run_benchmark, seed_dataset
+        from api.cache import get_cache_stats
+        from api.urls import router_v1
+
+        admin = seed_dataset(
+            titles=3, genres=2, categories=1, users=3,
+            reviews_per_title=2, comments_per_review=1,
+        )
+        results = run_benchmark(admin, iterations=2)
+
+        for pattern in router_v1.urls:
+            actions = getattr(pattern.callback, 'actions', {})
+            if 'get' in actions and 'format' not in pattern.pattern.regex.groupindex:
+                assert f'GET {pattern.name}' in results, (
+                    f'Проверьте, что маршрут {pattern.name} замеряется'
+                )
+        for name, metrics in results.items():
+            assert metrics['status'] < 400, (
+                f'Проверьте, что запрос {name} при замере успешен'
+            )
+            assert metrics['p95_ms'] >= metrics['p50_ms']
+            assert metrics['cached_p95_ms'] >= metrics['cached_p50_ms']
+        # Замер числа запросов, памяти и задержки для genre, categories и
+        # titles идёт мимо кеша ответов.
+        assert get_cache_stats()['misses'] >= 3 * (2 + 2), (
+            'Проверьте, что замер не ограничивается ответами из кеша'
+        )
+
+    def test_compare_with_baseline(self):
+        from api.benchmark import compare_with_baseline
+
+        baseline = {
+            'GET titles-list': {'queries': 3, 'p95_ms': 10, 'memory_kb': 100}
+        }
+        same = {
+            'GET titles-list': {'queries': 3, 'p95_ms': 11, 'memory_kb': 90}
+        }
+        worse = {
+            'GET titles-list': {'queries': 4, 'p95_ms': 20, 'memory_kb': 90}
+        }
+        assert compare_with_baseline(same, baseline) == []
+        assert len(compare_with_baseline(worse, baseline)) == 2
+        assert compare_with_baseline({}, baseline), (
+            'Проверьте, что отсутствующий в замере эндпоинт считается регрессией'
+        )
@@ -0,0 +1,243 @@
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def title_payload(count, genres=('genre-0', 'genre-1')):
+    return [
+        {
+            'name': f'Новинка {i}',
+            'year': 2020,
+            'description': 'Описание',
+            'genre': list(genres),
+            'category': 'movie',
+        }
+        for i in range(count)
+    ]
+
+
+@pytest.mark.django_db
+class TestBulkWrite:
+
+    def test_titles_bulk_create(self, admin_client, catalogue):
+        from reviews.models import Title, TitleRanking
+
+        payload = title_payload(20)
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.post(
+                '/api/v1/titles/bulk/', payload, format='json'
+            )
+        assert response.status_code == 200, (
+            'Проверьте, что POST /api/v1/titles/bulk/ возвращает статус 200'
+        )
+        data = response.json()
+        assert [item['name'] for item in data] == [
+            item['name'] for item in payload
+        ], 'Проверьте, что ответ сохраняет порядок элементов запроса'
+        assert {genre['slug'] for genre in data[0]['genre']} == {
+            'genre-0', 'genre-1'
+        }
+        created = Title.objects.filter(name__startswith='Новинка')
+        assert created.count() == 20
+        assert TitleRanking.objects.filter(title__in=created).count() == 20, (
+            'Проверьте, что для новых произведений созданы строки рейтинга'
+        )
+        slug_queries = [
+            query['sql'] for query in context.captured_queries
+            if '"reviews_genre"."slug" IN' in query['sql']
+            or '"reviews_category"."slug" IN' in query['sql']
+        ]
+        assert len(slug_queries) == 2, (
+            'Проверьте, что жанры и категории всех элементов загружаются '
+            'одним запросом на модель'
+        )
+
+    def test_titles_bulk_update(self, admin_client, catalogue):
+        title = catalogue[0]
+        payload = title_payload(1, genres=('genre-2',))
+        payload[0]['id'] = title.pk
+        response = admin_client.post(
+            '/api/v1/titles/bulk/', payload, format='json'
+        )
+        assert response.status_code == 200
+        title.refresh_from_db()
+        assert title.name == 'Новинка 0'
+        assert list(title.genre.values_list('slug', flat=True)) == [
+            'genre-2'
+        ], 'Проверьте, что жанры обновлённого произведения заменены'
+
+    def test_titles_bulk_update_invalidates_once(self, admin_client,
+                                                 catalogue, monkeypatch):
+        import api.signals
+
+        calls = []
+        monkeypatch.setattr(
+            api.signals, 'invalidate', lambda *scopes: calls.append(scopes)
+        )
+        payload = title_payload(len(catalogue))
+        for item, title in zip(payload, catalogue):
+            item['id'] = title.pk
+        response = admin_client.post(
+            '/api/v1/titles/bulk/', payload, format='json'
+        )
+        assert response.status_code == 200
+        assert calls == [('titles', 'rankings')], (
+            'Проверьте, что пакетное обновление сбрасывает кеш один раз, '
+            'а не на каждую удалённую связь с жанром'
+        )
+
+    def test_titles_bulk_errors_per_item(self, admin_client, catalogue):
+        from reviews.models import Title
+
+        payload = title_payload(3)
+        payload[1]['genre'] = ['unknown']
+        payload[2]['id'] = 10 ** 6
+        response = admin_client.post(
+            '/api/v1/titles/bulk/', payload, format='json'
+        )
+        assert response.status_code == 400
+        errors = response.json()
+        assert len(errors) == 3
+        assert errors[0] == {}
+        assert 'genre' in errors[1]
+        assert 'id' in errors[2]
+        assert not Title.objects.filter(name__startswith='Новинка').exists(), (
+            'Проверьте, что при ошибке не записывается ни один элемент'
+        )
+
+    def test_genres_bulk_upsert(self, admin_client, catalogue):
+        from reviews.models import Genre, Title
+
+        modified = Title.objects.get(pk=catalogue[0].pk).modified
+        response = admin_client.post('/api/v1/genres/bulk/', [
+            {'name': 'Переименованный', 'slug': 'genre-0'},
+            {'name': 'Новый', 'slug': 'new-genre'},
+        ], format='json')
+        assert response.status_code == 200
+        assert Genre.objects.get(slug='genre-0').name == 'Переименованный'
+        assert Genre.objects.filter(slug='new-genre').exists()
+        assert Title.objects.get(pk=catalogue[0].pk).modified > modified, (
+            'Проверьте, что изменение жанра обновляет дату произведений'
+        )
+
+    def test_genres_bulk_duplicate_slug(self, admin_client, catalogue):
+        response = admin_client.post('/api/v1/categories/bulk/', [
+            {'name': 'Книга', 'slug': 'book'},
+            {'name': 'Книги', 'slug': 'book'},
+        ], format='json')
+        assert response.status_code == 400
+        assert response.json()[0] == {}
+        assert 'slug' in response.json()[1]
+
+    def test_bulk_requires_admin(self, user_client, catalogue):
+        response = user_client.post(
+            '/api/v1/titles/bulk/', title_payload(1), format='json'
+        )
+        assert response.status_code == 403, (
+            'Проверьте, что пакетная запись доступна только администратору'
+        )
+
+
+@pytest.mark.django_db
+class TestBulkReviews:
+
+    def test_reviews_bulk_create(self, admin_client, catalogue,
+                                 django_user_model):
+        from reviews.models import Review, Title, TitleRanking
+
+        call_command('refresh_rankings')
+        readers = [
+            django_user_model.objects.create_user(
+                username=f'reader{i}', email=f'reader{i}@yamdb.fake'
+            )
+            for i in range(2)
+        ]
+        title = catalogue[0]
+        payload = [
+            {'title': title.pk, 'author': reader.username,
+             'text': 'Отзыв', 'score': 10}
+            for reader in readers
+        ] + [
+            # Повтор внутри пакета и уже существующий отзыв.
+            {'title': title.pk, 'author': 'reader0', 'text': 'Ещё',
+             'score': 1},
+            {'title': title.pk, 'author': 'author0', 'text': 'Ещё',
+             'score': 1},
+        ]
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.post(
+                '/api/v1/reviews/bulk/', payload, format='json'
+            )
+        assert response.status_code == 201, (
+            'Проверьте, что POST /api/v1/reviews/bulk/ возвращает статус 201'
+        )
+        assert response.json() == {'created': 2, 'skipped': 2}
+        assert title.reviews.count() == 5
+        expected = sum(title.reviews.values_list('score', flat=True)) / 5
+        assert Title.objects.get(pk=title.pk).rating == pytest.approx(
+            expected
+        ), 'Проверьте, что рейтинг пересчитан после загрузки пакета'
+        assert list(TitleRanking.objects.filter(stale=True).values_list(
+            'pk', flat=True
+        )) == [title.pk]
+        uniqueness_queries = [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith('SELECT')
+            and 'FROM "reviews_review"' in query['sql']
+        ]
+        assert len(uniqueness_queries) == 1, (
+            'Проверьте, что занятые пары проверяются одним запросом'
+        )
+        assert Review.objects.get(author__username='reader0').score == 10
+
+    def test_reviews_bulk_counts_concurrent_insert(self, admin_client,
+                                                   catalogue, monkeypatch):
+        from api.serializers import ReviewBulkListSerializer
+
+        taken_pairs = ReviewBulkListSerializer.taken_pairs
+        calls = []
+
+        def stale_taken_pairs(self, validated_data):
+            # Первая проверка не видит отзыв, вставленный параллельно.
+            calls.append(1)
+            if len(calls) == 1:
+                return set()
+            return taken_pairs(self, validated_data)
+
+        monkeypatch.setattr(
+            ReviewBulkListSerializer, 'taken_pairs', stale_taken_pairs
+        )
+        response = admin_client.post('/api/v1/reviews/bulk/', [
+            {'title': catalogue[0].pk, 'author': 'author0', 'text': 'Ещё',
+             'score': 1},
+        ], format='json')
+        assert response.status_code == 201
+        assert response.json() == {'created': 0, 'skipped': 1}, (
+            'Проверьте, что отзыв, занятый параллельной вставкой, '
+            'не считается созданным'
+        )
+        assert len(calls) == 2
+
+    def test_reviews_bulk_errors_per_item(self, admin_client, catalogue):
+        from reviews.models import Review
+
+        count = Review.objects.count()
+        response = admin_client.post('/api/v1/reviews/bulk/', [
+            {'title': catalogue[0].pk, 'author': 'author0', 'text': 'Отзыв',
+             'score': 5},
+            {'title': 10 ** 6, 'author': 'author0', 'text': 'Отзыв',
+             'score': 5},
+            {'title': catalogue[0].pk, 'author': 'nobody', 'text': 'Отзыв',
+             'score': 11},
+        ], format='json')
+        assert response.status_code == 400
+        errors = response.json()
+        assert errors[0] == {}
+        assert 'title' in errors[1]
+        assert {'author', 'score'} <= set(errors[2])
+        assert Review.objects.count() == count
+
+    def test_reviews_bulk_requires_admin(self, user_client, catalogue):
+        response = user_client.post('/api/v1/reviews/bulk/', [], format='json')
+        assert response.status_code == 403
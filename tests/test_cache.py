@@ -0,0 +1,64 @@
+import pytest
+
+
+@pytest.mark.django_db
+class TestResponseCache:
+
+    @pytest.mark.parametrize(
+        'url', ('/api/v1/genres/', '/api/v1/categories/', '/api/v1/titles/')
+    )
+    def test_repeated_get_is_cached(self, client, catalogue, url,
+                                    django_assert_num_queries):
+        from api.cache import get_cache_stats
+
+        first = client.get(url)
+        with django_assert_num_queries(0):
+            second = client.get(url)
+        assert second.json() == first.json(), (
+            f'Проверьте, что повторный GET {url} отдаётся из кеша'
+        )
+        assert get_cache_stats() == {'hits': 1, 'misses': 1}
+
+    def test_genre_change_invalidates_genres_and_titles(
+            self, client, catalogue):
+        from reviews.models import Genre
+
+        client.get('/api/v1/genres/')
+        client.get('/api/v1/titles/')
+        client.get('/api/v1/categories/')
+        genre = Genre.objects.get(slug='genre-0')
+        genre.name = 'Переименованный'
+        genre.save()
+
+        genres = client.get('/api/v1/genres/').json()['results']
+        assert 'Переименованный' in [item['name'] for item in genres]
+        titles = client.get('/api/v1/titles/').json()['results']
+        names = [item['name'] for title in titles for item in title['genre']]
+        assert 'Переименованный' in names
+        from api.cache import get_cache_stats
+        client.get('/api/v1/categories/')
+        assert get_cache_stats()['hits'] == 1, (
+            'Проверьте, что изменение жанра не сбрасывает кеш категорий'
+        )
+
+    def test_review_invalidates_titles_rating(self, user_client, catalogue):
+        title = catalogue[0]
+        before = user_client.get('/api/v1/titles/?name=Произведение 0')
+        user_client.post(
+            f'/api/v1/titles/{title.id}/reviews/',
+            data={'text': 'Отзыв', 'score': 10},
+        )
+        after = user_client.get('/api/v1/titles/?name=Произведение 0')
+        assert (
+            after.json()['results'][0]['rating']
+            != before.json()['results'][0]['rating']
+        ), 'Проверьте, что новый отзыв сбрасывает кеш списка произведений'
+
+    def test_other_models_keep_fast_delete(self):
+        from django.db.models.signals import post_delete, post_save
+        from users.models import OutboundEmail
+
+        assert not post_save.has_listeners(OutboundEmail)
+        assert not post_delete.has_listeners(OutboundEmail), (
+            'Проверьте, что сброс кеша подключён только к моделям каталога'
+        )
@@ -0,0 +1,70 @@
+import pytest
+
+
+@pytest.mark.django_db
+class TestConditionalGet:
+
+    def _urls(self, title):
+        review = title.reviews.first()
+        return (
+            '/api/v1/titles/',
+            f'/api/v1/titles/{title.id}/',
+            f'/api/v1/titles/{title.id}/reviews/',
+            f'/api/v1/titles/{title.id}/reviews/{review.id}/',
+            f'/api/v1/titles/{title.id}/reviews/{review.id}/comments/',
+        )
+
+    def test_not_modified(self, client, catalogue):
+        for url in self._urls(catalogue[0]):
+            response = client.get(url)
+            assert response.status_code == 200
+            assert response.has_header('ETag'), (
+                f'Проверьте, что GET {url} возвращает заголовок ETag'
+            )
+            assert response.has_header('Last-Modified')
+            response = client.get(
+                url, HTTP_IF_NONE_MATCH=response['ETag']
+            )
+            assert response.status_code == 304, (
+                f'Проверьте, что GET {url} с актуальным If-None-Match '
+                'возвращает 304'
+            )
+            assert not response.content
+
+    def test_etag_changes_after_comment(self, user_client, catalogue):
+        title = catalogue[0]
+        review = title.reviews.first()
+        # Список произведений не содержит комментариев.
+        urls = self._urls(title)[1:]
+        etags = {url: user_client.get(url)['ETag'] for url in urls}
+        response = user_client.post(
+            f'/api/v1/titles/{title.id}/reviews/{review.id}/comments/',
+            data={'text': 'Новый комментарий'},
+        )
+        assert response.status_code == 201
+        for url in urls:
+            response = user_client.get(url, HTTP_IF_NONE_MATCH=etags[url])
+            assert response.status_code == 200, (
+                f'Проверьте, что новый комментарий меняет ETag для {url}'
+            )
+
+    def test_list_etag_changes_after_review(self, user_client, catalogue,
+                                            django_assert_num_queries):
+        url = '/api/v1/titles/'
+        etag = user_client.get(url)['ETag']
+        response = user_client.post(
+            f'/api/v1/titles/{catalogue[0].id}/reviews/',
+            data={'text': 'Отзыв', 'score': 10},
+        )
+        assert response.status_code == 201
+        response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200, (
+            'Проверьте, что новый отзыв меняет ETag списка произведений'
+        )
+        with django_assert_num_queries(0):
+            response = user_client.get(
+                url, HTTP_IF_NONE_MATCH=response['ETag']
+            )
+        assert response.status_code == 304, (
+            'Проверьте, что ETag списка считается без запросов к каталогу'
+        )
@@ -0,0 +1,61 @@
+import pytest
+from django.db import connection
+
+
+@pytest.mark.django_db(transaction=True)
+class TestConnections:
+
+    def test_unusable_connection_is_closed(self, client, monkeypatch):
+        closed = []
+        connection.ensure_connection()
+        monkeypatch.setattr(connection, 'is_usable', lambda: False)
+        monkeypatch.setattr(connection, 'close', lambda: closed.append(1))
+        client.get('/api/v1/genres/')
+        assert closed, (
+            'Проверьте, что неработающее постоянное соединение закрывается '
+            'перед первым запросом к БД'
+        )
+
+    def test_cached_response_skips_health_check(self, client, monkeypatch):
+        client.get('/api/v1/genres/')
+        monkeypatch.setattr(
+            connection, 'is_usable',
+            lambda: pytest.fail('Соединение проверено без запроса к БД'),
+        )
+        assert client.get('/api/v1/genres/').status_code == 200
+
+    def test_health_checks_can_be_disabled(self, client, monkeypatch,
+                                           settings):
+        settings.DB_CONN_HEALTH_CHECKS = False
+        connection.ensure_connection()
+        monkeypatch.setattr(connection, 'is_usable', lambda: False)
+        monkeypatch.setattr(
+            connection, 'close', lambda: pytest.fail('Соединение закрыто')
+        )
+        assert client.get('/api/v1/genres/').status_code == 200
+
+    def test_connection_benchmark(self):
+        from api.benchmark import run_connection_benchmark
+
+        requests = 5
+        results = run_connection_benchmark(
+            '/api/v1/genres/', requests=requests, conn_max_age=30
+        )
+        assert set(results) == {0, 30}
+        for metrics in results.values():
+            assert metrics['status'] == 200
+            assert metrics['p95_ms'] >= metrics['p50_ms']
+            assert metrics['queries'] >= requests, (
+                'Проверьте, что каждый замеряемый запрос обращается к БД, '
+                'а не отдаётся из кеша'
+            )
+        # Соединение с базой SQLite в памяти Django не закрывает.
+        if not connection.is_in_memory_db():
+            assert results[0]['connections'] == requests
+            assert results[30]['connections'] == 1, (
+                'Проверьте, что при CONN_MAX_AGE соединение используется '
+                'повторно'
+            )
+        assert connection.settings_dict['CONN_MAX_AGE'] != 30, (
+            'Проверьте, что замер восстанавливает CONN_MAX_AGE'
+        )
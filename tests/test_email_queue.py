@@ -0,0 +1,76 @@
+from datetime import timedelta
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.management import call_command
+from django.utils import timezone
+
+
+class FailingBackend(BaseEmailBackend):
+
+    def send_messages(self, messages):
+        raise ConnectionError('SMTP недоступен')
+
+
+@pytest.mark.django_db
+class TestEmailQueue:
+
+    def test_signup_only_enqueues(self, client):
+        from users.models import OutboundEmail
+
+        response = client.post(
+            '/api/v1/auth/signup/',
+            data={'username': 'newuser', 'email': 'newuser@yamdb.fake'},
+        )
+        assert response.status_code == 200
+        assert mail.outbox == [], (
+            'Проверьте, что регистрация не отправляет письмо во время запроса'
+        )
+        email = OutboundEmail.objects.get()
+        assert email.to == 'newuser@yamdb.fake'
+        assert email.status == OutboundEmail.PENDING
+
+    def test_worker_sends_batch(self, client):
+        from users.models import OutboundEmail
+
+        for i in range(3):
+            client.post(
+                '/api/v1/auth/signup/',
+                data={'username': f'user{i}', 'email': f'user{i}@yamdb.fake'},
+            )
+        call_command('send_emails', once=True, batch_size=2)
+        assert len(mail.outbox) == 3
+        assert not OutboundEmail.objects.exclude(
+            status=OutboundEmail.SENT
+        ).exists(), 'Проверьте, что команда отправляет все готовые письма'
+
+    def test_retry_with_backoff(self, settings):
+        from users.mail import enqueue_email, send_pending
+        from users.models import OutboundEmail
+
+        settings.EMAIL_BACKEND = 'tests.test_email_queue.FailingBackend'
+        settings.EMAIL_QUEUE = {**settings.EMAIL_QUEUE, 'MAX_ATTEMPTS': 2}
+        email = enqueue_email('Тема', 'Текст', 'user@yamdb.fake')
+
+        assert send_pending() == (0, 1)
+        email.refresh_from_db()
+        assert email.status == OutboundEmail.PENDING
+        assert email.attempts == 1
+        assert email.next_attempt_at > timezone.now(), (
+            'Проверьте, что повторная попытка откладывается'
+        )
+        assert send_pending() == (0, 0), (
+            'Проверьте, что письмо не отправляется до наступления паузы'
+        )
+
+        OutboundEmail.objects.update(
+            next_attempt_at=timezone.now() - timedelta(seconds=1)
+        )
+        send_pending()
+        email.refresh_from_db()
+        assert email.status == OutboundEmail.FAILED, (
+            'Проверьте, что после MAX_ATTEMPTS попыток письмо помечается '
+            'неотправленным'
+        )
+        assert 'SMTP' in email.last_error
@@ -0,0 +1,40 @@
+import pytest
+
+
+@pytest.mark.django_db
+class TestTitleFilter:
+
+    def test_search(self, client, catalogue):
+        from reviews.models import Title
+
+        Title.objects.filter(pk=catalogue[3].pk).update(
+            description='Фильм о побеге из тюрьмы'
+        )
+        response = client.get('/api/v1/titles/?search=побеге')
+        assert response.status_code == 200
+        assert [item['id'] for item in response.json()['results']] == [
+            catalogue[3].id
+        ], 'Проверьте, что поиск ищет по описанию произведения'
+
+    def test_genre_is_exact_slug(self, client, catalogue):
+        response = client.get('/api/v1/titles/?genre=genre-1')
+        data = response.json()
+        expected = [
+            title for title in catalogue
+            if title.genre.filter(slug='genre-1').exists()
+        ]
+        assert data['count'] == len(expected), (
+            'Проверьте, что фильтр по жанру не дублирует произведения'
+        )
+        response = client.get('/api/v1/titles/?genre=genre')
+        assert response.json()['count'] == 0, (
+            'Проверьте, что фильтр по жанру сравнивает slug целиком'
+        )
+
+    def test_category_is_exact_slug(self, client, catalogue):
+        assert client.get(
+            '/api/v1/titles/?category=movie'
+        ).json()['count'] == len(catalogue)
+        assert client.get(
+            '/api/v1/titles/?category=mov'
+        ).json()['count'] == 0
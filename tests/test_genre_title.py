@@ -0,0 +1,26 @@
+import pytest
+from django.db import IntegrityError, transaction
+
+
+@pytest.mark.django_db
+class TestGenreTitle:
+
+    def test_genre_title_is_through_model(self, catalogue):
+        from reviews.models import GenreTitle, Title
+
+        assert Title.genre.through is GenreTitle, (
+            'Проверьте, что GenreTitle — промежуточная модель Title.genre'
+        )
+        title = catalogue[2]
+        assert set(
+            GenreTitle.objects.filter(title=title).values_list(
+                'genre__slug', flat=True
+            )
+        ) == set(title.genre.values_list('slug', flat=True))
+
+    def test_genre_title_is_unique(self, catalogue):
+        from reviews.models import GenreTitle
+
+        link = GenreTitle.objects.first()
+        with pytest.raises(IntegrityError), transaction.atomic():
+            GenreTitle.objects.create(title=link.title, genre=link.genre)
@@ -0,0 +1,62 @@
+import json
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+
+
+@pytest.mark.django_db
+class TestImportData:
+
+    def test_import_is_restartable(self):
+        from reviews.models import Comment, Review, Title
+
+        call_command('import_data', chunk_size=10)
+        counts = (
+            Title.objects.count(),
+            Review.objects.count(),
+            Comment.objects.count(),
+            Title.genre.through.objects.count(),
+        )
+        assert all(counts), 'Проверьте, что данные из static/data загружены'
+
+        call_command('import_data', chunk_size=7)
+        assert counts == (
+            Title.objects.count(),
+            Review.objects.count(),
+            Comment.objects.count(),
+            Title.genre.through.objects.count(),
+        ), 'Проверьте, что повторная загрузка не создаёт дубликатов'
+
+    def test_import_keeps_dates_and_rating(self):
+        from django.db.models import Avg
+        from reviews.models import Review, Title
+
+        call_command('import_data')
+        review = Review.objects.get(pk=1)
+        assert review.pub_date.year == 2019, (
+            'Проверьте, что дата публикации берётся из файла'
+        )
+        title = Title.objects.get(pk=review.title_id)
+        expected = title.reviews.aggregate(rating=Avg('score'))['rating']
+        assert title.rating == pytest.approx(expected)
+
+    @pytest.mark.skipif(
+        connection.vendor != 'postgresql',
+        reason='COPY используется только с PostgreSQL',
+    )
+    def test_copy_rows_without_id(self, tmp_path):
+        from reviews.models import Genre
+
+        rows = [
+            {'id': 500, 'name': 'С ключом', 'slug': 'with-id'},
+            {'name': 'Без ключа', 'slug': 'without-id'},
+        ]
+        (tmp_path / 'genre.jsonl').write_text(
+            '\n'.join(json.dumps(row) for row in rows)
+        )
+        call_command('import_data', path=str(tmp_path))
+        assert Genre.objects.get(slug='with-id').pk == 500
+        assert Genre.objects.filter(slug='without-id').exists(), (
+            'Проверьте, что строки без id загружаются через COPY'
+        )
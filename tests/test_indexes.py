@@ -0,0 +1,58 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def explain(sql):
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            # На маленьком наборе данных PostgreSQL выбирает полный
+            # просмотр таблицы, даже если индекс подходит.
+            cursor.execute('SET LOCAL enable_seqscan = off')
+            cursor.execute(f'EXPLAIN {sql}')
+        else:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+        return '\n'.join(str(row[-1]) for row in cursor.fetchall())
+
+
+@pytest.mark.django_db
+class TestIndexes:
+
+    @pytest.mark.parametrize('url, table, index', [
+        (
+            '/api/v1/titles/{title}/reviews/', 'reviews_review',
+            'review_title_pub_date_idx',
+        ),
+        (
+            '/api/v1/titles/{title}/reviews/?pagination=cursor',
+            'reviews_review', 'review_title_pub_date_idx',
+        ),
+        (
+            '/api/v1/titles/{title}/reviews/{review}/comments/',
+            'reviews_comment', 'comment_review_pub_date_idx',
+        ),
+        (
+            '/api/v1/titles/?category=movie&year=2003', 'reviews_title',
+            'title_category_year_idx',
+        ),
+        (
+            '/api/v1/titles/?genre=genre-1', 'reviews_title',
+            'title_genre_genre_title_idx',
+        ),
+    ])
+    def test_endpoint_uses_index(self, client, catalogue, url, table, index):
+        title = catalogue[3]
+        url = url.format(title=title.pk, review=title.reviews.first().pk)
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.status_code == 200
+        [sql] = [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith(f'SELECT "{table}"."id"')
+            and 'ORDER BY' in query['sql']
+        ]
+        plan = explain(sql)
+        assert index in plan, (
+            f'Проверьте, что запрос GET {url} использует индекс {index}:\n'
+            f'{plan}'
+        )
@@ -0,0 +1,29 @@
+import pytest
+
+
+@pytest.mark.django_db
+class TestMetrics:
+
+    def test_metrics_endpoint(self, client, user_client, catalogue):
+        client.get('/api/v1/titles/')
+        client.get('/api/v1/titles/')
+        user_client.get('/api/v1/genres/')
+        response = client.get('/metrics')
+        assert response.status_code == 200
+        content = response.content.decode()
+        for name in (
+            'yamdb_http_request_duration_seconds_bucket',
+            'yamdb_http_requests_total',
+            'yamdb_db_queries_per_request_bucket',
+            'yamdb_api_cache_hit_ratio',
+            'yamdb_active_users',
+        ):
+            assert name in content, (
+                f'Проверьте, что /metrics отдаёт метрику {name}'
+            )
+        assert (
+            'action="list",method="GET",view="titles-list"' in content
+        ), 'Проверьте, что метрики размечены по view и action'
+        # Одно попадание в кеш на два промаха (titles и genres).
+        assert 'yamdb_api_cache_hit_ratio 0.333' in content
+        assert 'yamdb_active_users 1.0' in content
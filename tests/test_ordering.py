@@ -0,0 +1,88 @@
+import pytest
+
+
+@pytest.fixture
+def unrated(catalogue):
+    from reviews.models import Title
+
+    return Title.objects.create(
+        name='Без отзывов', year=1999, category=catalogue[0].category
+    )
+
+
+def walk(client, url):
+    ids = []
+    while url:
+        data = client.get(url).json()
+        ids.extend((item['id'], item['rating']) for item in data['results'])
+        url = data['next']
+    return ids
+
+
+@pytest.mark.django_db
+class TestTitleOrdering:
+
+    @pytest.mark.parametrize('ordering, reverse', [
+        ('rating', False), ('-rating', True),
+    ])
+    def test_order_by_rating(self, client, catalogue, unrated, ordering,
+                             reverse):
+        ratings = walk(client, f'/api/v1/titles/?ordering={ordering}')
+        assert ratings[-1] == (unrated.pk, None), (
+            'Проверьте, что произведения без оценок идут в конце списка'
+        )
+        values = [rating for _, rating in ratings[:-1]]
+        assert values == sorted(values, reverse=reverse)
+        assert len(ratings) == len(catalogue) + 1, (
+            'Проверьте, что страницы не теряют и не повторяют записи'
+        )
+
+    def test_order_by_review_count(self, client, catalogue, unrated):
+        catalogue[3].reviews.first().delete()
+        ids = [
+            pk for pk, _ in walk(client, '/api/v1/titles/?ordering=review_count')
+        ]
+        assert ids[:2] == [unrated.pk, catalogue[3].pk]
+
+    def test_stored_rating_follows_reviews(self, catalogue):
+        from django.db.models import Avg
+        from reviews.models import Title
+
+        title = catalogue[0]
+        title.reviews.first().delete()
+        review = title.reviews.first()
+        review.score = 10
+        review.save()
+        expected = title.reviews.aggregate(rating=Avg('score'))['rating']
+        assert Title.objects.get(pk=title.pk).rating == pytest.approx(
+            expected
+        )
+        title.reviews.all().delete()
+        assert Title.objects.get(pk=title.pk).rating is None
+
+    @pytest.mark.parametrize('ordering, index', [
+        ('rating', 'title_rating_idx'),
+        ('-rating', 'title_rating_idx'),
+        ('review_count', 'title_review_count_idx'),
+        ('-review_count', 'title_review_count_idx'),
+    ])
+    def test_ordering_uses_index(self, catalogue, ordering, index):
+        from api.filters import TitleOrderingFilter
+        from django.db import connection
+        from reviews.models import Title
+
+        if connection.vendor == 'postgresql' and ordering == '-rating':
+            index = 'title_rating_desc_idx'
+
+        ordering_filter = TitleOrderingFilter()
+        terms = [ordering_filter.aliases.get(
+            ordering.lstrip('-'), ordering.lstrip('-')
+        )]
+        terms[0] = ('-' if ordering.startswith('-') else '') + terms[0]
+        terms.append('-id' if ordering.startswith('-') else 'id')
+        plan = Title.objects.order_by(
+            *(ordering_filter.order_expression(term) for term in terms)
+        )[:10].explain()
+        assert index in plan, (
+            f'Проверьте, что сортировка {ordering} использует индекс {index}'
+        )
@@ -0,0 +1,59 @@
+import pytest
+
+
+@pytest.mark.django_db
+class TestCursorPagination:
+
+    def _walk(self, client, url, django_assert_max_num_queries, max_queries):
+        seen = []
+        while url:
+            with django_assert_max_num_queries(max_queries):
+                response = client.get(url)
+            assert response.status_code == 200
+            data = response.json()
+            assert 'count' not in data, (
+                'Проверьте, что курсорная пагинация не считает общее '
+                'количество записей'
+            )
+            seen.extend(item['id'] for item in data['results'])
+            url = data['next']
+        return seen
+
+    def test_titles_cursor(self, client, catalogue,
+                           django_assert_max_num_queries):
+        ids = self._walk(
+            client, '/api/v1/titles/?pagination=cursor',
+            django_assert_max_num_queries, 3,
+        )
+        expected = sorted(catalogue, key=lambda title: (title.name, title.id))
+        assert ids == [title.id for title in expected], (
+            'Проверьте, что курсорная пагинация произведений проходит все '
+            'записи по порядку без пропусков и повторов'
+        )
+
+    def test_titles_cursor_rejects_search(self, client, catalogue):
+        response = client.get(
+            '/api/v1/titles/?pagination=cursor&search=Произведение'
+        )
+        assert response.status_code == 400, (
+            'Проверьте, что курсорная пагинация не смешивается с поиском'
+        )
+        assert 'pagination' in response.json()
+
+    def test_reviews_cursor(self, client, catalogue,
+                            django_assert_max_num_queries):
+        title = catalogue[0]
+        ids = self._walk(
+            client,
+            f'/api/v1/titles/{title.id}/reviews/?pagination=cursor',
+            django_assert_max_num_queries, 3,
+        )
+        assert sorted(ids) == sorted(
+            title.reviews.values_list('id', flat=True)
+        )
+
+    def test_page_number_by_default(self, client, catalogue):
+        response = client.get('/api/v1/titles/')
+        assert 'count' in response.json(), (
+            'Проверьте, что по умолчанию используется постраничная пагинация'
+        )
@@ -0,0 +1,42 @@
+import pytest
+from django.db.models import Avg
+from rest_framework.pagination import PageNumberPagination
+
+# Максимальное число SQL-запросов на один запрос к эндпоинту. Значения не
+# должны зависеть от размера страницы и количества отзывов.
+MAX_QUERIES = {
+    '/api/v1/titles/': 3,
+    '/api/v1/titles/{title_id}/': 2,
+}
+
+
+@pytest.mark.django_db
+class TestQueryCounts:
+
+    @pytest.mark.parametrize('page_size', (1, 5, 12))
+    def test_titles_list(self, client, catalogue, page_size, monkeypatch,
+                         django_assert_max_num_queries):
+        monkeypatch.setattr(PageNumberPagination, 'page_size', page_size)
+        url = '/api/v1/titles/'
+        with django_assert_max_num_queries(MAX_QUERIES[url]):
+            response = client.get(url)
+        assert response.status_code == 200, (
+            f'Проверьте, что GET {url} возвращает статус 200'
+        )
+        assert len(response.json()['results']) == page_size
+
+    def test_titles_detail(self, client, catalogue,
+                           django_assert_max_num_queries):
+        title = catalogue[-1]
+        url = '/api/v1/titles/{title_id}/'
+        with django_assert_max_num_queries(MAX_QUERIES[url]):
+            response = client.get(url.format(title_id=title.id))
+        assert response.status_code == 200, (
+            f'Проверьте, что GET {url} возвращает статус 200'
+        )
+        data = response.json()
+        expected = title.reviews.aggregate(rating=Avg('score'))['rating']
+        assert data['rating'] == pytest.approx(expected), (
+            'Проверьте, что рейтинг произведения рассчитан верно'
+        )
+        assert len(data['genre']) == title.genre.count()
@@ -0,0 +1,84 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+
+@pytest.mark.django_db
+class TestRankings:
+
+    def test_review_changes_mark_ranking_stale(self, catalogue):
+        from reviews.models import TitleRanking
+
+        call_command('refresh_rankings')
+        assert not TitleRanking.objects.filter(stale=True).exists()
+        catalogue[0].reviews.first().delete()
+        assert list(
+            TitleRanking.objects.filter(stale=True).values_list(
+                'pk', flat=True
+            )
+        ) == [catalogue[0].pk], (
+            'Проверьте, что изменение отзыва помечает рейтинг произведения'
+        )
+
+    def test_refresh_is_incremental(self, catalogue):
+        from reviews.models import Review, TitleRanking
+
+        call_command('refresh_rankings')
+        old = timezone.now() - timedelta(days=30)
+        Review.objects.update(pub_date=old)
+        call_command('refresh_rankings')
+        assert not TitleRanking.objects.filter(
+            recent_review_count__gt=0
+        ).exists(), 'Проверьте, что старые отзывы выходят из популярности'
+
+        before = dict(TitleRanking.objects.values_list('pk', 'refreshed'))
+        review = catalogue[1].reviews.first()
+        review.score = 10
+        review.save()
+        call_command('refresh_rankings')
+        after = dict(TitleRanking.objects.values_list('pk', 'refreshed'))
+        changed = [pk for pk in after if after[pk] != before[pk]]
+        assert changed == [catalogue[1].pk], (
+            'Проверьте, что пересчитываются только изменённые произведения'
+        )
+
+    def test_top_endpoint(self, client, catalogue):
+        call_command('refresh_rankings')
+        response = client.get('/api/v1/titles/top/')
+        assert response.status_code == 200
+        results = response.json()['results']
+        ratings = [title['rating'] for title in results]
+        assert ratings == sorted(ratings, reverse=True)
+        assert ratings[0] == 6.0
+        assert results[0]['review_count'] == 3
+
+    def test_trending_endpoint_filters(self, client, catalogue):
+        from reviews.models import Review
+
+        Review.objects.exclude(title=catalogue[2]).update(
+            pub_date=timezone.now() - timedelta(days=30)
+        )
+        call_command('refresh_rankings', full=True)
+        response = client.get(
+            '/api/v1/titles/trending/', {'genre': 'genre-2'}
+        )
+        results = response.json()['results']
+        assert results[0]['id'] == catalogue[2].pk
+        assert results[0]['recent_review_count'] == 3
+        assert all(
+            'genre-2' in [genre['slug'] for genre in title['genre']]
+            for title in results
+        ), 'Проверьте фильтрацию по жанру'
+
+    def test_refresh_invalidates_cache(self, client, catalogue):
+        call_command('refresh_rankings')
+        first = client.get('/api/v1/titles/top/').json()
+        for review in catalogue[0].reviews.all():
+            review.score = 10
+            review.save()
+        assert client.get('/api/v1/titles/top/').json() == first
+        call_command('refresh_rankings')
+        top = client.get('/api/v1/titles/top/').json()['results'][0]
+        assert top['id'] == catalogue[0].pk
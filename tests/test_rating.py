@@ -0,0 +1,78 @@
+import pytest
+from django.core.management import call_command
+
+
+def stored_rating(title):
+    from reviews.models import Title
+
+    return Title.objects.values_list(
+        'rating_sum', 'rating_count', 'rating'
+    ).get(pk=title.pk)
+
+
+@pytest.mark.django_db
+class TestStoredRating:
+
+    def test_rating_follows_reviews(self, django_user_model):
+        from reviews.models import Review, Title
+
+        title = Title.objects.create(name='Произведение', year=2000)
+        first, second = [
+            django_user_model.objects.create_user(
+                username=f'reader{i}', email=f'reader{i}@yamdb.fake'
+            )
+            for i in range(2)
+        ]
+        assert stored_rating(title) == (0, 0, None)
+
+        review = Review.objects.create(
+            title=title, author=first, text='Отзыв', score=6
+        )
+        assert stored_rating(title) == (6, 1, 6.0), (
+            'Проверьте, что новый отзыв учитывается в рейтинге'
+        )
+        other = Review.objects.create(
+            title=title, author=second, text='Отзыв', score=10
+        )
+        assert stored_rating(title) == (16, 2, 8.0)
+
+        review.score = 8
+        review.save()
+        assert stored_rating(title) == (18, 2, 9.0), (
+            'Проверьте, что изменение оценки пересчитывает рейтинг'
+        )
+
+        other.delete()
+        assert stored_rating(title) == (8, 1, 8.0), (
+            'Проверьте, что удаление отзыва пересчитывает рейтинг'
+        )
+        review.delete()
+        assert stored_rating(title) == (0, 0, None), (
+            'Проверьте, что без отзывов рейтинг пустой'
+        )
+
+    def test_recalculate_ratings_repairs_drift(self, catalogue):
+        from django.db.models import Avg, Count, Sum
+        from reviews.models import Title
+
+        drifted, empty = catalogue[0], catalogue[1]
+        Title.objects.filter(pk=drifted.pk).update(
+            rating_sum=1000, rating_count=1, rating=1000.0
+        )
+        empty.reviews.all().delete()
+        Title.objects.filter(pk=empty.pk).update(
+            rating_sum=5, rating_count=1, rating=5.0
+        )
+
+        call_command('recalculate_ratings', batch_size=5)
+
+        expected = drifted.reviews.aggregate(
+            rating_sum=Sum('score'), rating_count=Count('id'),
+            rating=Avg('score'),
+        )
+        rating_sum, rating_count, rating = stored_rating(drifted)
+        assert (rating_sum, rating_count) == (
+            expected['rating_sum'], expected['rating_count']
+        ), 'Проверьте, что команда восстанавливает сумму и число оценок'
+        assert rating == pytest.approx(expected['rating'])
+        assert stored_rating(empty) == (0, 0, None)
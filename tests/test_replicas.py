@@ -0,0 +1,116 @@
+import pytest
+from django.core.management import call_command
+from django.db import connections
+
+
+@pytest.fixture
+def replica(tmp_path, settings):
+    """Отдельный файл SQLite в роли реплики со своими данными."""
+    connections.databases['replica'] = {
+        **connections.databases['default'],
+        'NAME': str(tmp_path / 'replica.sqlite3'),
+        'TEST': {'NAME': str(tmp_path / 'replica.sqlite3')},
+    }
+    settings.DATABASE_ROUTERS = []
+    call_command('migrate', database='replica', verbosity=0)
+    settings.DATABASE_ROUTERS = ['api.routers.ReplicaRouter']
+    settings.DATABASE_REPLICAS = ['replica']
+    yield 'replica'
+    connections['replica'].close()
+    del connections['replica']
+    del connections.databases['replica']
+
+
+@pytest.mark.skipif(
+    connections.databases['default']['ENGINE'] != 'django.db.backends.sqlite3',
+    reason='Реплика имитируется файлом SQLite',
+)
+@pytest.mark.django_db(transaction=True)
+class TestReplicaRouting:
+
+    def test_safe_requests_read_from_replica(self, client, replica):
+        from reviews.models import Genre
+
+        Genre.objects.using(replica).create(name='Реплика', slug='replica')
+        response = client.get('/api/v1/genres/')
+        assert response.status_code == 200
+        assert [genre['slug'] for genre in response.json()['results']] == [
+            'replica'
+        ], 'Проверьте, что GET к каталогу читает данные из реплики'
+
+    def test_writes_go_to_primary(self, admin_client, replica):
+        from reviews.models import Genre
+
+        response = admin_client.post(
+            '/api/v1/genres/', {'name': 'Основная', 'slug': 'primary'}
+        )
+        assert response.status_code == 201
+        assert Genre.objects.using('default').filter(slug='primary').exists()
+        assert not Genre.objects.using(replica).exists(), (
+            'Проверьте, что запись не уходит в реплику'
+        )
+
+    def test_writer_sticks_to_primary(self, client, admin_client, replica,
+                                      settings):
+        from reviews.models import Genre
+
+        Genre.objects.using(replica).create(name='Реплика', slug='replica')
+        admin_client.post(
+            '/api/v1/genres/', {'name': 'Основная', 'slug': 'primary'}
+        )
+        slugs = [
+            genre['slug']
+            for genre in admin_client.get('/api/v1/genres/').json()['results']
+        ]
+        assert slugs == ['primary'], (
+            'Проверьте, что после записи пользователь читает из основной базы'
+        )
+        slugs = [
+            genre['slug']
+            for genre in client.get('/api/v1/genres/').json()['results']
+        ]
+        assert slugs == ['replica'], (
+            'Проверьте, что остальные пользователи читают из реплики'
+        )
+
+    def test_other_views_read_from_primary(self, admin_client, replica,
+                                           django_user_model):
+        django_user_model.objects.using(replica).create(
+            username='replica', email='replica@yamdb.fake'
+        )
+        usernames = [
+            user['username']
+            for user in admin_client.get('/api/v1/users/').json()['results']
+        ]
+        assert 'replica' not in usernames
+
+    def test_router_keeps_reads_after_write_on_primary(self, replica):
+        from api.routers import ReplicaRouter, replica_reads, use_replica
+        from django.contrib.auth.models import AnonymousUser
+        from reviews.models import Genre
+
+        router = ReplicaRouter()
+        with replica_reads():
+            use_replica(AnonymousUser())
+            assert router.db_for_read(Genre) == replica
+            router.db_for_write(Genre)
+            assert router.db_for_read(Genre) == 'default', (
+                'Проверьте, что чтение после записи идёт в основную базу'
+            )
+        assert router.db_for_read(Genre) == 'default'
+
+    def test_replica_responses_not_cached_after_change(self, client,
+                                                        replica):
+        from reviews.models import Genre
+
+        Genre.objects.using(replica).create(name='Старый', slug='old')
+        Genre.objects.create(name='Новый', slug='new')
+        client.get('/api/v1/genres/')
+        Genre.objects.using(replica).update(name='Новый', slug='new')
+        slugs = [
+            genre['slug']
+            for genre in client.get('/api/v1/genres/').json()['results']
+        ]
+        assert slugs == ['new'], (
+            'Проверьте, что ответ из отстающей реплики не кешируется'
+        )
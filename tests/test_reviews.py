@@ -0,0 +1,38 @@
+import pytest
+
+
+@pytest.mark.django_db
+class TestNestedResources:
+
+    def test_comment_review_must_belong_to_title(self, client, catalogue):
+        title, other_title = catalogue[0], catalogue[1]
+        review = title.reviews.first()
+        url = (
+            f'/api/v1/titles/{other_title.id}/reviews/{review.id}/comments/'
+        )
+        response = client.get(url)
+        assert response.status_code == 404, (
+            'Проверьте, что комментарии доступны только для отзыва, '
+            'относящегося к произведению из URL'
+        )
+
+    def test_create_review_once(self, user_client, catalogue,
+                                django_assert_max_num_queries):
+        title = catalogue[0]
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        data = {'text': 'Отзыв', 'score': 7}
+        with django_assert_max_num_queries(6):
+            response = user_client.post(url, data=data)
+        assert response.status_code == 201
+        response = user_client.post(url, data=data)
+        assert response.status_code == 400, (
+            'Проверьте, что нельзя оставить второй отзыв на произведение'
+        )
+
+    def test_create_comment(self, user_client, catalogue):
+        title = catalogue[0]
+        review = title.reviews.first()
+        url = f'/api/v1/titles/{title.id}/reviews/{review.id}/comments/'
+        response = user_client.post(url, data={'text': 'Комментарий'})
+        assert response.status_code == 201
+        assert response.json()['review'] == review.id
@@ -0,0 +1,74 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+SIGNUP_URL = '/api/v1/auth/signup/'
+TRANSACTION_CONTROL = ('BEGIN', 'SAVEPOINT', 'RELEASE SAVEPOINT')
+
+
+@pytest.mark.django_db
+class TestSignUp:
+
+    def test_new_user_query_count(self, client):
+        from users.models import OutboundEmail, User
+
+        with CaptureQueriesContext(connection) as queries:
+            response = client.post(SIGNUP_URL, data={
+                'username': 'newuser', 'email': 'newuser@yamdb.fake',
+            })
+        statements = [
+            query['sql'] for query in queries
+            if not query['sql'].startswith(TRANSACTION_CONTROL)
+        ]
+        # Поиск по имени или email, создание пользователя и письма.
+        assert len(statements) == 3, (
+            'Проверьте, что регистрация выполняет один поиск и две вставки'
+        )
+        assert response.status_code == 200
+        assert response.json() == {
+            'username': 'newuser', 'email': 'newuser@yamdb.fake',
+        }
+        assert User.objects.filter(username='newuser').exists()
+        assert OutboundEmail.objects.filter(to='newuser@yamdb.fake').exists()
+
+    def test_resend_code_query_count(self, client, user,
+                                     django_assert_num_queries):
+        from users.models import OutboundEmail
+
+        with django_assert_num_queries(2):
+            response = client.post(SIGNUP_URL, data={
+                'username': user.username, 'email': user.email,
+            })
+        assert response.status_code == 200
+        assert OutboundEmail.objects.filter(to=user.email).count() == 1, (
+            'Проверьте, что повторная регистрация отправляет код повторно'
+        )
+
+    @pytest.mark.parametrize('data, field', [
+        ({'username': 'TestUser', 'email': 'other@yamdb.fake'}, 'username'),
+        ({'username': 'other', 'email': 'testuser@yamdb.fake'}, 'email'),
+    ])
+    def test_conflicts(self, client, user, data, field,
+                       django_assert_num_queries):
+        with django_assert_num_queries(1):
+            response = client.post(SIGNUP_URL, data=data)
+        assert response.status_code == 400
+        assert list(response.json()) == [field], (
+            f'Проверьте, что занятое поле {field} возвращает ошибку'
+        )
+
+    def test_both_taken_by_different_users(self, client, user, admin):
+        response = client.post(SIGNUP_URL, data={
+            'username': user.username, 'email': admin.email,
+        })
+        assert response.status_code == 400
+        assert set(response.json()) == {'username', 'email'}
+
+    def test_me_is_forbidden(self, client, django_assert_num_queries):
+        with django_assert_num_queries(0):
+            response = client.post(SIGNUP_URL, data={
+                'username': 'me', 'email': 'me@yamdb.fake',
+            })
+        assert response.status_code == 400, (
+            'Проверьте, что имя me отклоняется без запроса к БД'
+        )
@@ -0,0 +1,54 @@
+import json
+import logging
+
+import pytest
+
+
+@pytest.fixture
+def profiling(settings):
+    settings.SQL_PROFILING = {
+        'ENABLED': True,
+        'SAMPLE_RATE': 1.0,
+        'SLOW_QUERY_MS': 10000,
+        'REPEATED_QUERY_THRESHOLD': 3,
+    }
+
+
+@pytest.mark.django_db
+class TestSQLProfiling:
+
+    def test_server_timing_header(self, profiling, client, catalogue,
+                                  caplog):
+        with caplog.at_level(logging.INFO, logger='api.sql'):
+            response = client.get('/api/v1/genres/')
+        assert response.has_header('Server-Timing'), (
+            'Проверьте, что ответ содержит заголовок Server-Timing'
+        )
+        assert 'db;dur=' in response['Server-Timing']
+        record = json.loads(caplog.records[-1].getMessage())
+        assert record['view'] == 'genre-list'
+        assert record['queries'] >= 1
+
+    def test_repeated_queries_are_reported(self, profiling, settings,
+                                           client, catalogue, caplog):
+        settings.SQL_PROFILING = {
+            **settings.SQL_PROFILING, 'REPEATED_QUERY_THRESHOLD': 1
+        }
+        with caplog.at_level(logging.INFO, logger='api.sql'):
+            client.get('/api/v1/titles/')
+        record = caplog.records[-1]
+        assert record.levelno == logging.WARNING
+        assert json.loads(record.getMessage())['repeated'], (
+            'Проверьте, что повторяющиеся запросы попадают в лог'
+        )
+
+    def test_query_shape_ignores_in_size(self):
+        from api.middleware import query_shape
+
+        assert query_shape('SELECT 1 WHERE id IN (%s, %s, %s)') == (
+            query_shape('SELECT 1 WHERE id IN (%s)')
+        )
+
+    def test_disabled_by_default(self, client, catalogue):
+        response = client.get('/api/v1/genres/')
+        assert not response.has_header('Server-Timing')
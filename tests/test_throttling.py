@@ -0,0 +1,138 @@
+import pytest
+from rest_framework.test import APIClient
+
+
+@pytest.fixture
+def rates(settings):
+    rest_framework = dict(settings.REST_FRAMEWORK)
+    rest_framework['DEFAULT_THROTTLE_RATES'] = {
+        'signup': '2/min',
+        'comments': '1/min',
+        'comments.moderator': '3/min',
+        'comments.admin': None,
+    }
+    settings.REST_FRAMEWORK = rest_framework
+
+
+def client_with_token(user):
+    from rest_framework_simplejwt.tokens import RefreshToken
+
+    token = RefreshToken.for_user(user).access_token
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+    return client
+
+
+def comments_url(title):
+    review = title.reviews.order_by('pk').first()
+    return f'/api/v1/titles/{title.pk}/reviews/{review.pk}/comments/'
+
+
+@pytest.mark.django_db
+class TestThrottling:
+
+    def test_signup_is_throttled(self, rates, client):
+        for i in range(2):
+            response = client.post('/api/v1/auth/signup/', data={
+                'username': f'user{i}', 'email': f'user{i}@yamdb.fake',
+            })
+            assert response.status_code == 200
+        response = client.post('/api/v1/auth/signup/', data={
+            'username': 'user3', 'email': 'user3@yamdb.fake',
+        })
+        assert response.status_code == 429, (
+            'Проверьте, что регистрация ограничена по частоте'
+        )
+        assert response.has_header('Retry-After')
+
+    def test_rates_depend_on_role(self, rates, catalogue, user,
+                                  django_user_model):
+        moderator = django_user_model.objects.create_user(
+            username='moderator', email='moderator@yamdb.fake',
+            role='moderator',
+        )
+        admin = django_user_model.objects.create_user(
+            username='admin', email='admin@yamdb.fake', role='admin',
+        )
+        url = comments_url(catalogue[0])
+        expected = {user: 1, moderator: 3, admin: 5}
+        for author, allowed in expected.items():
+            client = client_with_token(author)
+            statuses = [
+                client.post(url, data={'text': 'Комментарий'}).status_code
+                for _ in range(5)
+            ]
+            assert statuses.count(201) == allowed, (
+                f'Проверьте лимит комментариев для роли {author.role}'
+            )
+
+    def test_role_change_applies_to_issued_token(self, rates, catalogue,
+                                                 user):
+        client = client_with_token(user)
+        url = comments_url(catalogue[0])
+        statuses = [
+            client.post(url, data={'text': 'Комментарий'}).status_code
+            for _ in range(2)
+        ]
+        assert statuses == [201, 429]
+        user.role = 'moderator'
+        user.save()
+        # GET кеширует снимок пользователя с новой ролью.
+        client.get(url)
+        response = client.post(url, data={'text': 'Комментарий'})
+        assert response.status_code == 201, (
+            'Проверьте, что лимит зависит от текущей роли, а не от токена'
+        )
+
+    def test_role_without_user_cache(self, rates, catalogue, settings,
+                                     django_user_model):
+        settings.AUTH_USER_CACHE_TIMEOUT = 0
+        moderator = django_user_model.objects.create_user(
+            username='moderator', email='moderator@yamdb.fake',
+            role='moderator',
+        )
+        client = client_with_token(moderator)
+        url = comments_url(catalogue[0])
+        statuses = [
+            client.post(url, data={'text': 'Комментарий'}).status_code
+            for _ in range(4)
+        ]
+        assert statuses == [201, 201, 201, 429], (
+            'Проверьте, что без кеша пользователей действует лимит роли'
+        )
+
+    def test_role_after_snapshot_expired(self, rates, catalogue,
+                                         django_user_model):
+        from api.authentication import forget_user
+
+        moderator = django_user_model.objects.create_user(
+            username='moderator', email='moderator@yamdb.fake',
+            role='moderator',
+        )
+        client = client_with_token(moderator)
+        url = comments_url(catalogue[0])
+        assert client.post(
+            url, data={'text': 'Комментарий'}
+        ).status_code == 201
+        # Снимок истёк до следующего запроса.
+        forget_user(moderator.pk)
+        assert client.post(
+            url, data={'text': 'Комментарий'}
+        ).status_code == 201, (
+            'Проверьте, что после истечения снимка действует лимит роли'
+        )
+
+    def test_safe_methods_are_not_throttled(self, rates, catalogue, user):
+        client = client_with_token(user)
+        url = comments_url(catalogue[0])
+        client.post(url, data={'text': 'Комментарий'})
+        assert client.get(url).status_code == 200
+
+    def test_rejected_request_skips_database(self, rates, catalogue, user,
+                                             django_assert_num_queries):
+        client = client_with_token(user)
+        url = comments_url(catalogue[0])
+        client.post(url, data={'text': 'Комментарий'})
+        with django_assert_num_queries(0):
+            response = client.post(url, data={'text': 'Комментарий'})
+        assert response.status_code == 429